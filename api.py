@@ -0,0 +1,186 @@
+"""Headless-API: die Frames der Statistik-Seiten als JSON oder Arrow IPC, ohne Streamlit.
+
+    python api.py --port 8502
+
+    GET /api/pages                  Seiten, Spalten und aktueller Datenstand
+    GET /api/stats/<seite>.json     z.B. /api/stats/aim.json, eine Liste von Zeilen
+    GET /api/stats/<seite>.arrow    derselbe Frame als Arrow IPC Stream
+    GET /api/stats/all.json         alle Metriken aller Seiten
+
+Ohne Endung entscheidet der Accept-Header (Standard JSON). Jede Antwort trägt ein
+ETag aus Datenstand, Seite und Format; mit If-None-Match gibt es bei unverändertem
+Stand ein leeres 304. Fertige Antworten werden pro Datenstand gecacht, ein Poll
+kostet also nur den Blick auf das Manifest (höchstens einmal pro VERSION_TTL).
+"""
+import argparse
+import json
+import os
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pyarrow as pa
+
+from data_handling import data_version, get_stats_snapshot, page_frame
+from metrics import PAGES, page_columns
+from perf import cache_event, span
+
+
+MAX_AGE_SECONDS = int(os.environ.get("LEETIFY_API_MAX_AGE", "10"))
+VERSION_TTL = 1.0
+
+FORMATS = {
+    "json": "application/json; charset=utf-8",
+    "arrow": "application/vnd.apache.arrow.stream",
+}
+ALL_PAGES = "all"
+
+# (seite, format) -> (datenstand, body); der Datenstand ist der des Frames, aus dem body gebaut wurde
+_RESPONSES = {}
+# immer nur ein Thread baut eine Antwort, parallele Polls warten auf dasselbe Ergebnis
+_BUILD_LOCK = threading.Lock()
+
+
+def current_version():
+    """Datenstand, höchstens alle VERSION_TTL Sekunden neu aus dem Manifest bestimmt."""
+    return data_version(max_age=VERSION_TTL)
+
+
+def stats_frame(page_key, df):
+    if page_key == ALL_PAGES:
+        return df.reset_index(drop=True)
+    return page_frame(df, page_key)
+
+
+def encode_frame(df, fmt):
+    if fmt == "arrow":
+        table = pa.Table.from_pandas(df, preserve_index=False)
+        sink = pa.BufferOutputStream()
+        with pa.ipc.new_stream(sink, table.schema) as writer:
+            writer.write_table(table)
+        return sink.getvalue().to_pybytes()
+    return df.to_json(orient="records", force_ascii=False).encode("utf-8")
+
+
+def stats_response(page_key, fmt, version):
+    """(Datenstand, body) für (seite, format), aus dem Cache oder neu gebaut.
+
+    Ist version veraltet (siehe VERSION_TTL), wird aus dem aktuellen Frame gebaut und dessen
+    Datenstand geliefert; ETag und body gehören so immer zum selben Stand.
+    """
+    cached = _RESPONSES.get((page_key, fmt))
+    cache_event("api_response", cached is not None and cached[0] == version)
+    if cached is not None and cached[0] == version:
+        return cached
+
+    with _BUILD_LOCK:
+        cached = _RESPONSES.get((page_key, fmt))
+        if cached is not None and cached[0] == version:
+            return cached
+        frame_version, df = get_stats_snapshot()
+        with span("api.encode", page_key, format=fmt):
+            body = encode_frame(stats_frame(page_key, df), fmt)
+        _RESPONSES[(page_key, fmt)] = (frame_version, body)
+        return frame_version, body
+
+
+def pages_response(version):
+    pages = {key: {"title": page["title"], "columns": page_columns(key)} for key, page in PAGES.items()}
+    return version, json.dumps({"version": version, "pages": pages}, ensure_ascii=False).encode("utf-8")
+
+
+def _etag(version, *parts):
+    return '"' + "-".join([version, *parts]) + '"'
+
+
+class ApiHandler(BaseHTTPRequestHandler):
+    server_version = "LeetifyApi/1.0"
+
+    def do_GET(self):
+        path = self.path.split("?", 1)[0].rstrip("/")
+        version = current_version()
+
+        if path == "/api/pages":
+            self._send(version, ("pages",), FORMATS["json"], lambda: pages_response(version))
+            return
+
+        prefix = "/api/stats/"
+        if not path.startswith(prefix):
+            self._error(404, "Unbekannter Pfad")
+            return
+
+        page_key, _, fmt = path[len(prefix):].partition(".")
+        if not fmt:
+            fmt = "arrow" if "arrow" in self.headers.get("Accept", "") else "json"
+        if page_key not in PAGES and page_key != ALL_PAGES:
+            self._error(404, f"Unbekannte Seite: {page_key}")
+            return
+        if fmt not in FORMATS:
+            self._error(406, f"Unbekanntes Format: {fmt}")
+            return
+
+        self._send(version, (page_key, fmt), FORMATS[fmt], lambda: stats_response(page_key, fmt, version))
+
+    def _send(self, version, etag_parts, content_type, body_func):
+        """body_func liefert (datenstand, body); ETag und X-Data-Version nehmen dessen Datenstand."""
+        etag = _etag(version, *etag_parts)
+        if etag in [tag.strip() for tag in self.headers.get("If-None-Match", "").split(",")]:
+            cache_event("api_not_modified", True)
+            self.send_response(304)
+            self._common_headers(etag)
+            self.end_headers()
+            return
+
+        version, body = body_func()
+        etag = _etag(version, *etag_parts)
+        self.send_response(200)
+        self._common_headers(etag)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.send_header("X-Data-Version", version)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _common_headers(self, etag):
+        self.send_header("ETag", etag)
+        self.send_header("Cache-Control", f"public, max-age={MAX_AGE_SECONDS}")
+        # ohne Endung entscheidet Accept über JSON oder Arrow; geteilte Caches müssen das unterscheiden
+        self.send_header("Vary", "Accept")
+
+    def _error(self, status, message):
+        body = json.dumps({"error": message}, ensure_ascii=False).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", FORMATS["json"])
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_request(self, code="-", size="-"):
+        # nur Fehler ausgeben, sonst flutet jeder Poll die Konsole
+        if str(getattr(code, "value", code)).startswith(("4", "5")):
+            super().log_request(code, size)
+
+
+def make_server(host="127.0.0.1", port=8502):
+    return ThreadingHTTPServer((host, port), ApiHandler)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Leetify-Statistiken als JSON/Arrow ausliefern")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8502)
+    args = parser.parse_args()
+
+    server = make_server(args.host, args.port)
+    # Frame vorab bauen, damit der erste Client nicht auf das Laden wartet
+    stats_response(ALL_PAGES, "json", current_version())
+    print(f"✅ API läuft auf http://{args.host}:{args.port}/api/pages")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,233 @@
+"""Lade- und Render-Benchmark mit synthetischen player_data-Verzeichnissen.
+
+Aufruf:
+    python benchmark.py                       # 10, 1000 und 10000 Spieler
+    python benchmark.py --sizes 10 1000 --repeat 3 --output bench_results.json
+
+Die Profile werden aus einer vorhandenen Datei in player_data/ als Vorlage erzeugt
+(Zahlenwerte verrauscht, 100 recent_matches aus einem gemeinsamen Match-Pool).
+Dazu kommt die Importzeit der Module, die main.py bzw. die Seiten beim Start brauchen
+(jeweils in einem frischen Interpreter, in dem streamlit wie im Server schon geladen ist).
+Ergebnis ist eine JSON-Datei mit allen Zeiten in Sekunden.
+"""
+import argparse
+import contextlib
+import copy
+import json
+import os
+import platform
+import random
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+import uuid
+
+import data_handling
+import match_history
+import profile_format
+from data_handling import PLAYER_DATA_DIR
+
+
+MATCHES_PER_PLAYER = 100
+# main.py braucht nur data_manifest, die Statistik-Seiten stats_page
+IMPORT_MODULES = ("data_manifest", "perf", "data_handling", "stats_page", "plotly.express")
+
+
+def _template_profile(data_dir=PLAYER_DATA_DIR):
+    """Das Profil mit den meisten recent_matches dient als Vorlage (als dict wie aus der API)."""
+    profiles = [profile_format.read_profile(os.path.join(data_dir, file_name))
+                for file_name in data_handling._profile_files(data_dir)]
+    return profile_format.profile_dict(max(profiles, key=lambda player: len(player.recent_matches)))
+
+
+def _jitter(value, rng):
+    if isinstance(value, bool) or not isinstance(value, (int, float)):
+        return value
+    noisy = value * rng.uniform(0.7, 1.3)
+    return round(noisy) if isinstance(value, int) else noisy
+
+
+def generate_player_data(target_dir, players, template, seed=0):
+    """Schreibt `players` synthetische Profile nach target_dir."""
+    rng = random.Random(seed)
+    template_matches = template.get("recent_matches") or []
+    maps = sorted({match["map_name"] for match in template_matches}) or ["de_inferno"]
+
+    # gemeinsamer Pool, damit sich Matches wie bei echten Stacks überschneiden
+    pool_size = max(MATCHES_PER_PLAYER, players * MATCHES_PER_PLAYER // 3)
+    match_pool = [
+        (str(uuid.UUID(int=rng.getrandbits(128))), f"2026-{rng.randint(1, 12):02d}-{rng.randint(1, 28):02d}T"
+         f"{rng.randint(0, 23):02d}:{rng.randint(0, 59):02d}:00.000Z", rng.choice(maps))
+        for _ in range(pool_size)
+    ]
+    steam_ids = [str(76561190000000000 + index) for index in range(players)]
+
+    os.makedirs(target_dir, exist_ok=True)
+    for index, steam_id in enumerate(steam_ids):
+        profile = copy.deepcopy(template)
+        profile["steam64_id"] = steam_id
+        profile["name"] = f"bench_{index}"
+        for block in ("rating", "stats"):
+            profile[block] = {key: _jitter(value, rng) for key, value in profile[block].items()}
+
+        matches = []
+        for match_id, finished_at, map_name in rng.sample(match_pool, MATCHES_PER_PLAYER):
+            match = copy.deepcopy(rng.choice(template_matches)) if template_matches else {}
+            match.update({
+                "id": match_id, "finished_at": finished_at, "map_name": map_name,
+                "outcome": rng.choice(["win", "loss", "tie"]),
+                "leetify_rating": rng.gauss(0, 0.05),
+            })
+            matches.append(match)
+        profile["recent_matches"] = matches
+        profile["recent_teammates"] = [
+            {"steam64_id": mate, "recent_matches_count": rng.randint(1, 50)}
+            for mate in rng.sample(steam_ids, min(10, players))
+            if mate != steam_id
+        ]
+
+        profile_format.write_profile(
+            os.path.join(target_dir, f"{steam_id}-bench_{index}{profile_format.PROFILE_SUFFIX}"), profile)
+
+
+def _reset_caches():
+    """Prozess-Caches leeren, damit der nächste Aufruf wirklich kalt ist."""
+    data_handling._PROFILE_CACHE.clear()
+    data_handling._LOAD_ERRORS.clear()
+    data_handling._STATS_FRAME = None
+    match_history._INDEX.update({"manifest": {}, "file_rows": {}, "matches": None, "player_matches": None,
+                                 "derived": {}})
+
+
+def _timed(results, name, func, repeat=1):
+    timings = []
+    value = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+            value = func()
+        timings.append(time.perf_counter() - start)
+    results[name] = min(timings)
+    return value
+
+
+def measure_imports(repeat=1, modules=IMPORT_MODULES):
+    """Importzeit pro Modul in Sekunden, jeweils in einem frischen Interpreter."""
+    code = "import time, streamlit; start = time.perf_counter(); import {}; print(time.perf_counter() - start)"
+    repo_dir = os.path.dirname(os.path.abspath(__file__))
+    results = {}
+    for module in modules:
+        timings = []
+        for _ in range(repeat):
+            output = subprocess.run([sys.executable, "-c", code.format(module)], cwd=repo_dir,
+                                    capture_output=True, text=True, check=True).stdout
+            timings.append(float(output.split()[-1]))
+        results[module] = min(timings)
+    return results
+
+
+def run_size(players, template, work_dir, repeat):
+    data_dir = os.path.join(work_dir, f"player_data_{players}")
+    store_dir = os.path.join(work_dir, f"roster_store_{players}")
+
+    start = time.perf_counter()
+    generate_player_data(data_dir, players, template)
+    results = {"players": players, "generate": time.perf_counter() - start}
+
+    def cold_profiles():
+        _reset_caches()
+        shutil.rmtree(store_dir, ignore_errors=True)
+        return data_handling.get_stats_frame(data_dir, store_dir)
+
+    def cold_store():
+        _reset_caches()
+        return data_handling.get_stats_frame(data_dir, store_dir)
+
+    _timed(results, "cold_load_profiles", cold_profiles, repeat)
+    _timed(results, "cold_load_store", cold_store, repeat)
+    df = _timed(results, "warm_load", lambda: data_handling.get_stats_frame(data_dir, store_dir), repeat)
+
+    _timed(results, "get_all_player_data_warm", lambda: data_handling.get_all_player_data(data_dir), repeat)
+
+    def cold_match_index():
+        match_history._INDEX.update({"manifest": {}, "file_rows": {}, "matches": None, "player_matches": None,
+                                     "derived": {}})
+        return match_history.get_match_index(data_dir)
+
+    _timed(results, "match_index_build", cold_match_index, repeat)
+    _timed(results, "map_aggregate", lambda: match_history.get_map_aggregate(data_dir), repeat)
+
+    from ranking import build_ranking
+    ranking = _timed(results, "ranking_build", lambda: build_ranking(df), repeat)
+
+    from similarity import build_model, nearest
+    model = _timed(results, "similarity_build", lambda: build_model(ranking), repeat)
+    steam_id = model["steam_ids"][0]
+    _timed(results, "similarity_query", lambda: nearest(steam_id, model=model), repeat)
+
+    results["pages"] = {page_key: _bench_page(df, page_key, repeat) for page_key in _page_keys()}
+    return results
+
+
+def _page_keys():
+    from metrics import PAGES
+    return list(PAGES)
+
+
+def _bench_page(df, page_key, repeat):
+    from metrics import page_columns
+    from stats_page import bar_chart_specs, build_bar_chart, build_radar_chart, melt_radar_frame
+
+    page = {}
+    df_page = _timed(page, "frame", lambda: df[["Name", "SteamID", *page_columns(page_key)]].reset_index(drop=True),
+                     repeat)
+    df_long = _timed(page, "melt", lambda: melt_radar_frame(df_page, page_key), repeat)
+    _timed(page, "radar_figure", lambda: build_radar_chart(df_long, page_key).to_json(), repeat)
+
+    specs = bar_chart_specs(page_key)
+    _timed(page, "bar_figure_one", lambda: build_bar_chart(df_page, *specs[0][:3]).to_json(), repeat)
+    _timed(page, "bar_figures_all",
+           lambda: [build_bar_chart(df_page, *spec[:3]).to_json() for spec in specs], repeat)
+    return page
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark für data_handling und Seiten-Rendering")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10, 1000, 10000])
+    parser.add_argument("--repeat", type=int, default=1, help="Wiederholungen, gemeldet wird das Minimum")
+    parser.add_argument("--output", default="bench_results.json")
+    parser.add_argument("--work-dir", help="Verzeichnis für die synthetischen Daten (Standard: temporär)")
+    args = parser.parse_args()
+
+    template = _template_profile()
+    work_dir = args.work_dir or tempfile.mkdtemp(prefix="leetify_bench_")
+
+    report = {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+        "created_at": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "results": [],
+    }
+    report["import_time"] = measure_imports(args.repeat)
+    print("⏱️ Import: " + ", ".join(f"{module} {seconds:.3f}s" for module, seconds in report["import_time"].items()))
+    try:
+        for players in args.sizes:
+            print(f"⏱️ {players} Spieler ...")
+            result = run_size(players, template, work_dir, args.repeat)
+            report["results"].append(result)
+            print(f"   kalt (Profile): {result['cold_load_profiles']:.3f}s, kalt (Store): "
+                  f"{result['cold_load_store']:.3f}s, warm: {result['warm_load']:.4f}s")
+    finally:
+        if not args.work_dir:
+            shutil.rmtree(work_dir, ignore_errors=True)
+
+    with open(args.output, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2)
+    print(f"✅ Ergebnisse geschrieben: {args.output}")
+
+
+if __name__ == "__main__":
+    main()
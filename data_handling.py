@@ -1,134 +1,270 @@
 import os.path
+import threading
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 import pandas as pd
-import pickle
 
+import profile_model
+import roster_store
+from data_manifest import PLAYER_DATA_DIR, data_version, diff_manifests, directory_manifest, get_data_date
+from data_manifest import manifest_version
+from data_manifest import profile_files as _profile_files
+from perf import cache_event, span
+from metrics import all_metrics, page_columns
 
-def get_all_player_data():
-    all_play_data = []
 
-    for file_name in os.listdir("player_data"):
-        full_path = os.path.join("player_data", file_name)
-        try:
-            with open(full_path, "rb") as f:
-                player_data = pickle.load(f)
-        except Exception as e:
-            print(f"❌ Fehler beim Laden von {file_name}: {e}")
-            return None
+# Prozessweiter Cache: Pfad -> (mtime, size, profil). Jede Datei wird nur neu
+# gelesen, wenn sich Änderungszeit oder Größe geändert haben.
+_PROFILE_CACHE = {}
 
-        if player_data is not None:
-            all_play_data.append(player_data)
-            print(f"✅ Geladen: {file_name}")
+# Pfad -> (mtime, size, fehlertext) der Dateien, die nicht geladen werden konnten.
+# Eine defekte Datei wird erst nach einer Änderung erneut versucht.
+_LOAD_ERRORS = {}
+
+# Paralleles Dekodieren: Anzahl Worker und "thread" oder "process".
+# Threads überlappen vor allem das Lesen; Prozesse müssen das fertige Profil zurück
+# pickeln und lohnen sich erst bei vielen Kernen.
+LOAD_WORKERS = int(os.environ.get("LEETIFY_LOAD_WORKERS", min(8, os.cpu_count() or 1)))
+LOAD_EXECUTOR = os.environ.get("LEETIFY_LOAD_EXECUTOR", "thread")
+PARALLEL_MIN_FILES = 32
+
+# (manifest, DataFrame) des zuletzt gebauten Frames mit allen Metriken. Der Frame wird nie
+# in place verändert: ein Patch baut eine Kopie und tauscht das Tupel unter _STATS_LOCK aus.
+_STATS_FRAME = None
+_STATS_LOCK = threading.Lock()
+# nur ein Thread prüft und baut den Roster-Store, die anderen lesen danach den fertigen Stand
+_STORE_LOCK = threading.Lock()
+
+
+def _read_profile_file(full_path):
+    """Liest eine Profildatei. Liefert (profil, None) oder (None, fehlertext); läuft auch im Worker-Prozess."""
+    try:
+        return profile_model.read_profile(full_path), None
+    except Exception as e:
+        return None, f"{type(e).__name__}: {e}"
+
+
+def _decode_files(paths, workers=LOAD_WORKERS, executor=LOAD_EXECUTOR):
+    """Dekodiert mehrere Dateien, ab PARALLEL_MIN_FILES parallel. Ergebnis in der Reihenfolge von paths."""
+    if workers <= 1 or len(paths) < PARALLEL_MIN_FILES:
+        return [_read_profile_file(path) for path in paths]
+
+    pool_class = ProcessPoolExecutor if executor == "process" else ThreadPoolExecutor
+    with pool_class(max_workers=workers) as pool:
+        # map() liefert in Eingabereihenfolge, das Ergebnis ist also deterministisch
+        return list(pool.map(_read_profile_file, paths, chunksize=max(1, len(paths) // (workers * 4))))
+
+
+def _cached_profile(full_path, stat):
+    """(treffer, profil) aus dem Cache; bekannte defekte Dateien zählen als Treffer mit profil None."""
+    for cache in (_PROFILE_CACHE, _LOAD_ERRORS):
+        cached = cache.get(full_path)
+        if cached is not None and cached[0] == stat.st_mtime_ns and cached[1] == stat.st_size:
+            cache_event("profile_file", True)
+            return True, cached[2] if cache is _PROFILE_CACHE else None
+    cache_event("profile_file", False)
+    return False, None
+
+
+def _store_profile(full_path, stat, player_data, error):
+    file_name = os.path.basename(full_path)
+    if error is not None:
+        _LOAD_ERRORS[full_path] = (stat.st_mtime_ns, stat.st_size, error)
+        _PROFILE_CACHE.pop(full_path, None)
+        print(f"❌ Fehler beim Laden von {file_name}: {error}")
+        return None
+
+    _LOAD_ERRORS.pop(full_path, None)
+    _PROFILE_CACHE[full_path] = (stat.st_mtime_ns, stat.st_size, player_data)
+    print(f"✅ Geladen: {file_name}")
+    return player_data
+
+
+def _load_profile(full_path):
+    """Lädt ein einzelnes Profil, bei unveränderter Datei aus dem Cache. None bei Ladefehler."""
+    stat = os.stat(full_path)
+    hit, player_data = _cached_profile(full_path, stat)
+    if hit:
+        return player_data
+    return _store_profile(full_path, stat, *_read_profile_file(full_path))
+
+
+def get_all_player_data(data_dir=PLAYER_DATA_DIR, workers=LOAD_WORKERS):
+    """Alle Profile, sortiert nach Dateiname. Defekte Dateien werden übersprungen (siehe get_load_errors)."""
+    with span("load.profiles"):
+        return _read_all_player_data(data_dir, workers)
+
+
+def _read_all_player_data(data_dir, workers):
+    paths = [os.path.join(data_dir, file_name) for file_name in sorted(_profile_files(data_dir))]
+    stats = {path: os.stat(path) for path in paths}
+
+    profiles, misses = {}, []
+    for path in paths:
+        hit, profiles[path] = _cached_profile(path, stats[path])
+        if not hit:
+            misses.append(path)
+    for path, (player_data, error) in zip(misses, _decode_files(misses, workers)):
+        profiles[path] = _store_profile(path, stats[path], player_data, error)
+
+    # gelöschte Dateien aus dem Cache werfen
+    seen_paths = set(paths)
+    for cache in (_PROFILE_CACHE, _LOAD_ERRORS):
+        for full_path in list(cache):
+            if os.path.dirname(full_path) == data_dir and full_path not in seen_paths:
+                cache.pop(full_path, None)
+
+    return [player_data for player_data in profiles.values() if player_data is not None]
+
+
+def get_load_errors(data_dir=PLAYER_DATA_DIR):
+    """Dateiname -> Fehlertext aller Profile, die beim letzten Laden nicht gelesen werden konnten."""
+    return {
+        os.path.basename(path): cached[2] for path, cached in _LOAD_ERRORS.items() if os.path.dirname(path) == data_dir
+    }
+
+
+def load_player_file(file_name, data_dir=PLAYER_DATA_DIR):
+    """Lädt eine einzelne Profildatei über den Profil-Cache (None bei Ladefehler)."""
+    return _load_profile(os.path.join(data_dir, file_name))
+
+
+def build_roster_store(data_dir=PLAYER_DATA_DIR, store_dir=roster_store.STORE_DIR):
+    """Baut den spaltenorientierten Roster-Store aus den Profildateien neu."""
+    manifest = directory_manifest(data_dir)
+    roster_store.write_store(get_all_player_data(data_dir), manifest, store_dir)
+    return manifest
+
+
+def load_store_table(name, columns=None, data_dir=PLAYER_DATA_DIR, store_dir=roster_store.STORE_DIR):
+    """Liefert eine Tabelle des Roster-Stores; ist der Store veraltet, wird er aus den Profildateien neu gebaut."""
+    with _STORE_LOCK:
+        if roster_store.read_manifest(store_dir) != directory_manifest(data_dir):
+            with span("load.build_store"):
+                build_roster_store(data_dir, store_dir)
+    with span("load.store", table=name):
+        return roster_store.read_table(name, columns, store_dir)
+
+
+def load_profile_table(columns=None, data_dir=PLAYER_DATA_DIR, store_dir=roster_store.STORE_DIR):
+    """Liefert die flache Profiltabelle (rating.*, stats.*, ranks.*)."""
+    return load_store_table("profiles", columns, data_dir, store_dir)
+
+
+def _source_columns():
+    sources = set()
+    for metric in all_metrics():
+        source = metric["source"]
+        sources.update(source if isinstance(source, list) else [source])
+    return sorted(sources)
+
+
+def metric_frame(profiles):
+    """Berechnet alle Registry-Metriken aus einer flachen Profiltabelle."""
+    columns = {"Name": profiles["name"], "SteamID": profiles["steam64_id"]}
+    for metric in all_metrics():
+        source = metric["source"]
+        if isinstance(source, list):
+            values = profiles[source].mean(axis=1)
         else:
-            # Fehlermeldungen werden bereits in load_data_pickle ausgegeben
-            print(f"⚠️ Übersprungen: {file_name} (Ladefehler)")
+            values = profiles[source]
+        columns[metric["column"]] = values * metric.get("scale", 1)
 
-    return all_play_data
+    df = pd.DataFrame(columns)
+    df.index = df["SteamID"].rename(None)
+    return df
 
 
-def get_all_rating():
-    all_stats = []
-
-    for player in get_all_player_data():
-        stats = {
-            "Name": player["name"],
-            "SteamID": player["steam64_id"],
-            "Aim_Rating": player["rating"]["aim"],
-            "Utility_Rating": player["rating"]['utility'],
-            "Opening_Kill_Success": player["rating"]["opening"] * 1000,
-            "Clutch_Percentage": player["rating"]["clutch"],
-            "Positioning_Rating": player["rating"]["positioning"],
-            "Leetify_Rating": (player["rating"]["ct_leetify"] + player["rating"]["t_leetify"]) / 2,
-            "Headshot_Percentage": player["stats"]["accuracy_head"]
-        }
-
-        all_stats.append(stats)
-
-    # Konvertiere die Liste der Dictionaries in einen Pandas DataFrame
-    df = pd.DataFrame(all_stats)
+def _steam_id_from_file(file_name):
+    # Dateien heißen <steam64_id>-<name>
+    return file_name.split("-", 1)[0]
+
+
+def _patch_stats_frame(df, changes, manifest, data_dir):
+    """Neuer Frame, in dem nur die Zeilen der hinzugefügten, geänderten und entfernten Dateien ersetzt sind."""
+    added, modified, removed = changes
+
+    stale_ids = {_steam_id_from_file(name) for name in added + modified + removed}
+    df = df[~df.index.isin(stale_ids)]
+
+    # jede betroffene SteamID aus den Dateien neu laden, die es noch gibt: bei einer Umbenennung
+    # (neue Datei schreiben, alte löschen) bleibt der Spieler sonst ganz weg
+    stale_files = [name for name in manifest if _steam_id_from_file(name) in stale_ids]
+    changed_profiles = [load_player_file(name, data_dir) for name in stale_files]
+    changed_profiles = [player for player in changed_profiles if player is not None]
+    if changed_profiles:
+        rows = metric_frame(pd.DataFrame([player.flat() for player in changed_profiles]))
+        df = pd.concat([df, rows])
+
+    for name in removed:
+        _PROFILE_CACHE.pop(os.path.join(data_dir, name), None)
     return df
 
 
+def get_stats_frame(data_dir=PLAYER_DATA_DIR, store_dir=roster_store.STORE_DIR):
+    """Ein gemeinsamer Frame mit Name, SteamID und allen Metriken aller Seiten.
+
+    Der erste Aufruf liest den Roster-Store, danach werden nur noch die Zeilen
+    geänderter Dateien nachgeladen. Der gelieferte Frame ist schreibgeschützt zu behandeln.
+    """
+    return get_stats_snapshot(data_dir, store_dir)[1]
+
+
+def get_stats_snapshot(data_dir=PLAYER_DATA_DIR, store_dir=roster_store.STORE_DIR):
+    """(Datenstand, Frame) wie get_stats_frame, der Datenstand passt garantiert zu genau diesem Frame."""
+    global _STATS_FRAME
+
+    with _STATS_LOCK:
+        manifest = directory_manifest(data_dir)
+        cache_event("stats_frame", _STATS_FRAME is not None and _STATS_FRAME[0] == manifest)
+        if _STATS_FRAME is None:
+            profiles = load_profile_table(["name", "steam64_id", *_source_columns()], data_dir, store_dir)
+            with span("extract.metrics"):
+                _STATS_FRAME = (manifest, metric_frame(profiles))
+        elif _STATS_FRAME[0] != manifest:
+            old_manifest, df = _STATS_FRAME
+            changes = diff_manifests(old_manifest, manifest)
+            with span("extract.patch"):
+                _STATS_FRAME = (manifest, _patch_stats_frame(df, changes, manifest, data_dir))
+            print(f"🔄 Aktualisiert: {len(changes[0])} neu, {len(changes[1])} geändert, {len(changes[2])} entfernt")
+
+        return manifest_version(_STATS_FRAME[0]), _STATS_FRAME[1]
+
+
+def page_frame(df, page_key):
+    """Projiziert die Spalten einer Seite aus einem Frame von get_stats_frame."""
+    return df[["Name", "SteamID", *page_columns(page_key)]].reset_index(drop=True)
+
+
+def get_page_stats(page_key):
+    """Projiziert die Spalten einer Seite aus dem gemeinsamen Frame."""
+    return page_frame(get_stats_frame(), page_key)
+
+
+def get_all_rating():
+    return get_page_stats("rating")
+
+
 def get_all_aim_stats():
-    weapon_stats = []
-    for player in get_all_player_data():
-        stats = {
-            "Name": player["name"],
-            "SteamID": player["steam64_id"],
-            "accuracy_enemy_spotted": player["stats"]["accuracy_enemy_spotted"],
-            "counter_strafing_good_shots_ratio": player["stats"]["counter_strafing_good_shots_ratio"],
-            "reaction_time_ms": player["stats"]["reaction_time_ms"],
-            "spray_accuracy": player["stats"]["spray_accuracy"],
-            "preaim": player["stats"]["preaim"]
-        }
-        weapon_stats.append(stats)
-    df = pd.DataFrame(weapon_stats)
-    return df
+    return get_page_stats("aim")
 
 
 def get_all_duell_stats():
-    weapon_stats = []
-    for player in get_all_player_data():
-        stats = {
-            "Name": player["name"],
-            "SteamID": player["steam64_id"],
-            "ct_opening_aggression_success_rate": player["stats"]["ct_opening_aggression_success_rate"],
-            "ct_opening_duel_success_percentage": player["stats"]["ct_opening_duel_success_percentage"],
-            "t_opening_aggression_success_rate": player["stats"]["t_opening_aggression_success_rate"],
-            "t_opening_duel_success_percentage": player["stats"]["t_opening_duel_success_percentage"],
-        }
-        weapon_stats.append(stats)
-    df = pd.DataFrame(weapon_stats)
-    return df
+    return get_page_stats("duell")
 
 
 def get_all_trade_stats():
-    weapon_stats = []
-    for player in get_all_player_data():
-        stats = {
-            "Name": player["name"],
-            "SteamID": player["steam64_id"],
-            "traded_deaths_success_percentage": player["stats"]["traded_deaths_success_percentage"],
-            "trade_kill_opportunities_per_round": player["stats"]["trade_kill_opportunities_per_round"],
-            "trade_kills_success_percentage": player["stats"]["trade_kills_success_percentage"],
-        }
-        weapon_stats.append(stats)
-    df = pd.DataFrame(weapon_stats)
-    return df
+    return get_page_stats("trade")
 
 
 def get_all_flash_stats():
-    weapon_stats = []
-    for player in get_all_player_data():
-        stats = {
-            "Name": player["name"],
-            "SteamID": player["steam64_id"],
-            "flashbang_hit_foe_avg_duration": player["stats"]["flashbang_hit_foe_avg_duration"],
-            "flashbang_hit_foe_per_flashbang": player["stats"]["flashbang_hit_foe_per_flashbang"],
-            "flashbang_hit_friend_per_flashbang": player["stats"]["flashbang_hit_friend_per_flashbang"],
-            "flashbang_leading_to_kill": player["stats"]["flashbang_leading_to_kill"],
-            "flashbang_thrown": player["stats"]["flashbang_thrown"],
-        }
-        weapon_stats.append(stats)
-    df = pd.DataFrame(weapon_stats)
-    return df
+    return get_page_stats("flash")
 
 
 def get_all_he_stats():
-    weapon_stats = []
-    for player in get_all_player_data():
-        stats = {
-            "Name": player["name"],
-            "SteamID": player["steam64_id"],
-            "he_foes_damage_avg": player["stats"]["he_foes_damage_avg"],
-            "he_friends_damage_avg": player["stats"]["he_friends_damage_avg"],
-            "utility_on_death_avg": player["stats"]["utility_on_death_avg"],
-        }
-        weapon_stats.append(stats)
-    df = pd.DataFrame(weapon_stats)
-    return df
+    return get_page_stats("he")
 
 
 ## debug stuff
 # print(get_all_duell_stats())
 #
-# print(get_all_player_data()[0]["stats"])
+# print(get_all_player_data()[0].stats)
@@ -0,0 +1,92 @@
+"""Datenstand von player_data/ ohne pandas: Manifest, Fingerabdruck und Datum.
+
+main.py braucht bei jedem Start und jedem Auto-Refresh nur diese Funktionen; sie
+liegen deshalb getrennt von data_handling, damit der erste Seitenaufbau nicht auf
+den Import von pandas und pyarrow wartet. data_handling reicht sie unverändert weiter.
+
+Ein Skriptlauf fragt den Datenstand an mehreren Stellen ab (main, Seite, Ranking,
+Ähnlichkeit, Qualität); data_version und get_data_date teilen sich deshalb einen
+Verzeichnisdurchlauf, der höchstens MANIFEST_TTL Sekunden alt ist.
+"""
+import hashlib
+import json
+import os.path
+import threading
+import time
+from datetime import datetime
+
+from profile_format import PROFILE_SUFFIX
+
+
+PLAYER_DATA_DIR = "player_data"
+
+MANIFEST_TTL = 1.0
+
+# data_dir -> (checked_at, manifest, version) des letzten Durchlaufs
+_CURRENT = {}
+_CURRENT_LOCK = threading.Lock()
+
+
+def profile_files(data_dir):
+    """Alle Profildateien; versteckte Dateien (z.B. halb geschriebene .tmp) werden ignoriert.
+
+    Ein altes Pickle, zu dem es schon eine umgewandelte .msgpack-Datei gibt, wird übersprungen.
+    """
+    names = [name for name in os.listdir(data_dir) if not name.startswith(".")]
+    converted = set(names)
+    return [name for name in names if name + PROFILE_SUFFIX not in converted]
+
+
+def directory_manifest(data_dir=PLAYER_DATA_DIR):
+    """Dateiname -> [mtime_ns, size] aller Profildateien."""
+    manifest = {}
+    for file_name in sorted(profile_files(data_dir)):
+        stat = os.stat(os.path.join(data_dir, file_name))
+        manifest[file_name] = [stat.st_mtime_ns, stat.st_size]
+    return manifest
+
+
+def diff_manifests(old, new):
+    """Vergleicht zwei Manifeste und liefert (hinzugefügt, geändert, entfernt)."""
+    added = [name for name in new if name not in old]
+    modified = [name for name in new if name in old and old[name] != new[name]]
+    removed = [name for name in old if name not in new]
+    return added, modified, removed
+
+
+def manifest_version(manifest):
+    """Fingerabdruck eines Manifests (siehe data_version)."""
+    raw = json.dumps(manifest, sort_keys=True)
+    return hashlib.sha1(raw.encode("utf-8")).hexdigest()[:16]
+
+
+def _current(data_dir, max_age):
+    """(manifest, version), höchstens max_age Sekunden alt."""
+    now = time.monotonic()
+    with _CURRENT_LOCK:
+        cached = _CURRENT.get(data_dir)
+        if cached is not None and now - cached[0] <= max_age:
+            return cached[1:]
+
+    manifest = directory_manifest(data_dir)
+    version = manifest_version(manifest)
+    with _CURRENT_LOCK:
+        _CURRENT[data_dir] = (now, manifest, version)
+    return manifest, version
+
+
+def data_version(data_dir=PLAYER_DATA_DIR, max_age=MANIFEST_TTL):
+    """Kurzer Fingerabdruck des Datenstands, ändert sich mit jeder Profildatei.
+
+    max_age=0 erzwingt einen frischen Durchlauf, z.B. direkt nach dem Schreiben.
+    """
+    return _current(data_dir, max_age)[1]
+
+
+def get_data_date(data_dir=PLAYER_DATA_DIR, max_age=MANIFEST_TTL):
+    """Änderungszeit der neuesten Profildatei."""
+    manifest = _current(data_dir, max_age)[0]
+    if not manifest:
+        return None
+    newest = max(mtime_ns for mtime_ns, _ in manifest.values())
+    return datetime.fromtimestamp(newest / 1e9)
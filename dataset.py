@@ -0,0 +1,42 @@
+"""Gemeinsame Datenbasis aller Sessions.
+
+Die Loader der Seiten laufen über st.cache_resource: pro Datenstand liegt jedes
+Ergebnis genau einmal im Prozess und wird allen Sessions und Reruns als dasselbe
+Objekt gegeben (st.cache_data würde es bei jedem Treffer neu entpicklen). Die Frames
+sind deshalb schreibgeschützt zu behandeln: Seiten wählen Spalten und filtern Zeilen,
+verändern aber nie in place. Mit Copy-on-Write sind solche Ableitungen billig und
+können das gemeinsame Objekt nicht verändern.
+"""
+import pandas as pd
+import streamlit as st
+
+from data_handling import get_stats_frame
+from metrics import page_columns
+from perf import cache_call, cache_miss
+
+if int(pd.__version__.split(".")[0]) < 3:
+    # ab pandas 3 ist Copy-on-Write immer aktiv
+    pd.set_option("mode.copy_on_write", True)
+
+
+@st.cache_resource(max_entries=2)
+def _stats_frame(version):
+    cache_miss("st.stats_frame")
+    # data_handling ersetzt seinen Frame bei Dateiänderungen, statt ihn zu verändern
+    return get_stats_frame()
+
+
+def stats_frame(version):
+    """Der gemeinsame Frame mit Name, SteamID und allen Metriken (nicht verändern)."""
+    cache_call("st.stats_frame")
+    return _stats_frame(version)
+
+
+def page_frame(version, page_key):
+    """Name, SteamID und die Spalten einer Seite als View auf den gemeinsamen Frame."""
+    return stats_frame(version)[["Name", "SteamID", *page_columns(page_key)]]
+
+
+def player_names(version):
+    """SteamID -> Name."""
+    return stats_frame(version).set_index("SteamID")["Name"]
@@ -0,0 +1,70 @@
+import streamlit as st
+import plotly.express as px
+
+from data_handling import data_version
+from dataset import player_names
+from match_history import FORM_WINDOWS, get_form_summary, get_rating_form
+from perf import cache_call, cache_miss, span
+
+
+@st.cache_resource(max_entries=2)
+def load_form_data(version):
+    """Rating-Verlauf mit gleitenden Mitteln und Form-Übersicht, einmal pro Datenstand."""
+    cache_miss("st.load_form_data")
+    names = player_names(version)
+
+    form = get_rating_form().reset_index()
+    form["Name"] = form["steam64_id"].map(names)
+
+    summary = get_form_summary().reset_index()
+    summary.insert(0, "Name", summary["steam64_id"].map(names))
+    return form, summary
+
+
+st.title("📈Leetify Form Verlauf")
+st.markdown("---")
+
+with span("load", "form"):
+    cache_call("st.load_form_data")
+    df_form, df_summary = load_form_data(data_version())
+
+if df_form.empty:
+    st.warning("Keine Matches in den geladenen Profilen gefunden.")
+    st.stop()
+
+player_options = sorted(df_summary["Name"].dropna().unique().tolist())
+
+selected_players = st.multiselect(
+    "Wähle die Spieler für den Vergleich:",
+    options=player_options,
+    default=player_options,
+)
+
+if not selected_players:
+    st.warning("Bitte wähle mindestens einen Spieler aus, um die Statistiken anzuzeigen.")
+    st.stop()
+
+window = st.radio("Gleitendes Mittel über die letzten … Matches", FORM_WINDOWS, horizontal=True)
+
+df_filtered = df_form[df_form["Name"].isin(selected_players)]
+
+fig = px.line(
+    df_filtered,
+    x="finished_at",
+    y=f"rolling_{window}",
+    color="Name",
+    title=f"Leetify Rating, gleitendes Mittel über {window} Matches",
+)
+fig.update_layout(xaxis_title="Datum", yaxis_title="Leetify Rating", legend_title_text="Spieler")
+with span("render.serialize", "form"):
+    st.plotly_chart(fig, use_container_width=True)
+
+st.subheader("Form-Übersicht")
+st.markdown("Trend: Steigung des Ratings pro Match über alle geladenen Matches. "
+            "Serie: aktuelle Serie gleicher Ergebnisse.")
+
+st.dataframe(
+    df_summary[df_summary["Name"].isin(selected_players)].drop(columns="steam64_id")
+    .sort_values("trend_per_match", ascending=False),
+    hide_index=True,
+)
@@ -0,0 +1,57 @@
+import pandas as pd
+import streamlit as st
+import plotly.express as px
+
+from perf import cache_call, cache_miss, span
+from snapshot_store import HISTORY_COLUMNS, compare, read_index
+
+
+@st.cache_resource(max_entries=20)
+def load_comparison(start, end):
+    """Vergleich zweier Snapshots; der Store ist append-only, das Ergebnis ändert sich also nie."""
+    cache_miss("st.load_comparison")
+    return compare(start, end)
+
+
+def format_snapshot(taken_at):
+    return pd.Timestamp(taken_at).tz_convert("Europe/Berlin").strftime("%d.%m.%Y %H:%M")
+
+
+st.title("🕰️Leetify Verlauf")
+st.markdown("---")
+
+snapshots = [entry["taken_at"] for entry in read_index()]
+if len(snapshots) < 2:
+    st.info("Für einen Vergleich braucht es mindestens zwei Snapshots. Neue Snapshots entstehen bei jedem "
+            "Abruf mit leetify_fetcher.py oder mit `python snapshot_store.py`.")
+    st.stop()
+
+col_start, col_end = st.columns(2)
+start = col_start.selectbox("Von:", options=snapshots, index=0, format_func=format_snapshot)
+end = col_end.selectbox("Bis:", options=snapshots, index=len(snapshots) - 1, format_func=format_snapshot)
+
+with span("load", "history"):
+    cache_call("st.load_comparison")
+    df_compare = load_comparison(start, end)
+
+metric = st.radio("Wert:", list(HISTORY_COLUMNS), horizontal=True)
+df_metric = df_compare[["Name", f"{metric} vorher", f"{metric} nachher", f"{metric} Δ"]] \
+    .dropna(subset=[f"{metric} Δ"]).sort_values(f"{metric} Δ", ascending=False)
+
+fig = px.bar(
+    df_metric,
+    x="Name",
+    y=f"{metric} Δ",
+    title=f"Veränderung {metric}: {format_snapshot(start)} → {format_snapshot(end)}",
+    color=f"{metric} Δ",
+    color_continuous_scale=px.colors.diverging.RdYlGn,
+    color_continuous_midpoint=0,
+)
+fig.update_layout(xaxis_title="Spieler", yaxis_title=f"Δ {metric}")
+with span("render.serialize", "history"):
+    st.plotly_chart(fig, use_container_width=True)
+
+st.dataframe(df_metric, hide_index=True)
+
+st.subheader("Alle Werte")
+st.dataframe(df_compare, hide_index=True)
@@ -0,0 +1,17 @@
+"""Gemeinsame Retry-Regeln der Fetcher (leetify_fetcher mit requests, rank_fetcher mit aiohttp)."""
+import random
+
+
+RETRY_STATUS = {429, 500, 502, 503, 504}
+
+
+def retry_delay(attempt, response=None):
+    """Exponentielles Backoff mit Jitter, Retry-After des Servers hat Vorrang.
+
+    response kann eine requests- oder aiohttp-Antwort sein, gelesen werden nur die Header.
+    """
+    if response is not None:
+        retry_after = response.headers.get("Retry-After")
+        if retry_after and retry_after.isdigit():
+            return float(retry_after)
+    return min(30.0, 0.5 * 2 ** attempt) * (0.5 + random.random())
@@ -0,0 +1,310 @@
+"""Lädt Leetify-Profile parallel und legt sie als player_data/<steam64_id>-<name> ab.
+
+Aufruf:
+    python leetify_fetcher.py 76561197961498793 76561197961665931 ...
+    python leetify_fetcher.py --ids-file steam_ids.txt --workers 16 --rate 5
+    python leetify_fetcher.py --selftest       # gegen einen lokalen Stub, in einem Temp-Verzeichnis
+
+ETag / Last-Modified aus FETCH_STATE_FILE werden nur mitgeschickt, wenn die
+Profildatei der SteamID noch in data_dir liegt; sonst würde der Server mit 304
+antworten und ein gelöschtes Profil nie wieder geladen.
+"""
+import argparse
+import hashlib
+import json
+import os
+import random
+import shutil
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+
+import profile_format
+import profile_quality
+import roster_store
+import snapshot_store
+from data_manifest import PLAYER_DATA_DIR, profile_files
+from http_retry import RETRY_STATUS, retry_delay
+
+
+API_URL = "https://api-public.cs-prod.leetify.com/v3/profile"
+
+# ETag / Last-Modified pro SteamID, liegt bewusst außerhalb von player_data/
+FETCH_STATE_FILE = "fetch_state.json"
+
+class TokenBucket:
+    """Einfacher thread-sicherer Token Bucket: `rate` Anfragen pro Sekunde, Bursts bis `capacity`."""
+
+    def __init__(self, rate, capacity=None):
+        self.rate = rate
+        self.capacity = capacity or max(1, rate)
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self.lock = threading.Lock()
+
+    def acquire(self):
+        while True:
+            with self.lock:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                wait = (1 - self.tokens) / self.rate
+            time.sleep(wait)
+
+
+def make_session(pool_size):
+    """Session mit Connection-Pool passend zur Anzahl Worker."""
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+
+    api_key = os.environ.get("LEETIFY_API_KEY")
+    if api_key:
+        session.headers["Authorization"] = f"Bearer {api_key}"
+    return session
+
+
+def fetch_profile(session, bucket, steam_id, validators, api_url=API_URL, max_retries=4, timeout=15):
+    """Holt ein Profil. Liefert (profil oder None bei 304, neue Validatoren)."""
+    headers = {}
+    if validators.get("etag"):
+        headers["If-None-Match"] = validators["etag"]
+    if validators.get("last_modified"):
+        headers["If-Modified-Since"] = validators["last_modified"]
+
+    for attempt in range(max_retries + 1):
+        bucket.acquire()
+        try:
+            response = session.get(api_url, params={"steam64_id": steam_id}, headers=headers, timeout=timeout)
+        except requests.RequestException:
+            if attempt == max_retries:
+                raise
+            time.sleep(retry_delay(attempt))
+            continue
+
+        if response.status_code in RETRY_STATUS and attempt < max_retries:
+            time.sleep(retry_delay(attempt, response))
+            continue
+
+        if response.status_code == 304:
+            return None, validators
+
+        response.raise_for_status()
+        new_validators = {
+            "etag": response.headers.get("ETag"),
+            "last_modified": response.headers.get("Last-Modified"),
+        }
+        return response.json(), new_validators
+
+
+def _safe_file_name(profile):
+    name = str(profile.get("name") or "").replace(os.sep, "_").replace("/", "_")
+    return f"{profile['steam64_id']}-{name}{profile_format.PROFILE_SUFFIX}"
+
+
+def write_profile(profile, data_dir=PLAYER_DATA_DIR):
+    """Validiert und schreibt ein Profil atomar und räumt alte Dateinamen derselben SteamID weg."""
+    file_name = _safe_file_name(profile)
+    profile_format.write_profile(os.path.join(data_dir, file_name), profile)
+
+    # Namensänderung oder altes Pickle: andere Dateien derselben SteamID entfernen
+    prefix = f"{profile['steam64_id']}-"
+    for other in os.listdir(data_dir):
+        if other.startswith(prefix) and other != file_name:
+            os.remove(os.path.join(data_dir, other))
+
+    return file_name
+
+
+def load_fetch_state(state_file=FETCH_STATE_FILE):
+    try:
+        with open(state_file, encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def save_fetch_state(state, state_file=FETCH_STATE_FILE):
+    tmp_path = f"{state_file}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(state, f, indent=2)
+    os.replace(tmp_path, state_file)
+
+
+def _local_steam_ids(data_dir):
+    """SteamIDs, zu denen in data_dir eine Profildatei liegt."""
+    if not os.path.isdir(data_dir):
+        return set()
+    return {file_name.split("-", 1)[0] for file_name in profile_files(data_dir)}
+
+
+def fetch_all(steam_ids, workers=8, rate=5.0, api_url=API_URL, data_dir=PLAYER_DATA_DIR,
+              state_file=FETCH_STATE_FILE, quality_file=profile_quality.QUALITY_FILE,
+              snapshot_dir=snapshot_store.SNAPSHOT_DIR, store_dir=roster_store.STORE_DIR):
+    """Lädt alle Profile parallel. Liefert {"updated": [...], "unchanged": [...], "failed": {id: fehler}}."""
+    state = load_fetch_state(state_file)
+    # ohne lokale Datei unbedingt laden, sonst hält ein 304 ein gelöschtes Profil für aktuell
+    local_ids = _local_steam_ids(data_dir)
+    bucket = TokenBucket(rate)
+    session = make_session(workers)
+    result = {"updated": [], "unchanged": [], "failed": {}}
+    lock = threading.Lock()
+
+    def fetch_one(steam_id):
+        try:
+            known = state.get(steam_id, {}) if steam_id in local_ids else {}
+            profile, validators = fetch_profile(session, bucket, steam_id, known, api_url)
+            if profile is not None:
+                file_name = write_profile(profile, data_dir)
+                print(f"✅ Aktualisiert: {file_name}")
+                report = profile_quality.check_file(os.path.join(data_dir, file_name), quality_file)
+                if report["quality"] != profile_quality.FULL:
+                    print(f"⚠️ {file_name}: {profile_quality.QUALITY_LABELS[report['quality']]}, "
+                          f"{len(report['missing'])} Felder fehlen")
+        except Exception as e:
+            print(f"❌ Fehler beim Abrufen von {steam_id}: {e}")
+            with lock:
+                result["failed"][steam_id] = str(e)
+            return
+
+        with lock:
+            state[steam_id] = validators
+            result["unchanged" if profile is None else "updated"].append(steam_id)
+
+    os.makedirs(data_dir, exist_ok=True)
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        list(pool.map(fetch_one, steam_ids))
+
+    save_fetch_state(state, state_file)
+    profile_quality.save(quality_file)
+    if result["updated"]:
+        entry = snapshot_store.record_snapshot(data_dir, snapshot_dir, store_dir=store_dir)
+        if entry is not None:
+            print(f"✅ Snapshot {entry['taken_at']} ({entry['rows']} Zeilen)")
+    return result
+
+
+class _StubHandler(BaseHTTPRequestHandler):
+    """Antwortet wie der Leetify-Profilendpunkt mit einem pro SteamID festen Profil und ETag."""
+
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+
+    def do_GET(self):
+        steam_id = parse_qs(urlsplit(self.path).query)["steam64_id"][0]
+        rng = random.Random(steam_id)
+        body = {
+            "steam64_id": steam_id,
+            "name": f"Stub {steam_id[-4:]}",
+            "privacy_mode": "public",
+            "winrate": round(rng.uniform(0.3, 0.7), 3),
+            "total_matches": rng.randint(50, 2000),
+            "ranks": {"leetify": round(rng.uniform(-3, 3), 2), "premier": rng.randint(1000, 30000)},
+            "rating": {field: round(rng.uniform(0, 100), 2) for field in profile_format.Rating.__struct_fields__},
+        }
+        raw = json.dumps(body).encode("utf-8")
+        etag = f'"{hashlib.sha1(raw).hexdigest()[:16]}"'
+        if self.headers.get("If-None-Match") == etag:
+            self.send_response(304)
+            self.send_header("ETag", etag)
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(raw)))
+        self.send_header("ETag", etag)
+        self.end_headers()
+        self.wfile.write(raw)
+
+    def log_request(self, code="-", size="-"):
+        pass
+
+
+def start_stub():
+    """Startet einen Stub-Server im Hintergrund. Liefert (server, api_url dazu)."""
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _StubHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_port}{urlsplit(API_URL).path}"
+
+
+def selftest():
+    """Prüft gegen den Stub: erster Lauf lädt, zweiter bekommt 304, eine gelöschte Datei wird neu geladen."""
+    steam_ids = ["76561197960000001", "76561197960000002"]
+    server, api_url = start_stub()
+    work_dir = tempfile.mkdtemp(prefix="leetify_fetch_")
+    paths = {
+        "data_dir": os.path.join(work_dir, "player_data"),
+        "state_file": os.path.join(work_dir, FETCH_STATE_FILE),
+        "quality_file": os.path.join(work_dir, profile_quality.QUALITY_FILE),
+        "snapshot_dir": os.path.join(work_dir, "snapshots"),
+        "store_dir": os.path.join(work_dir, "roster_store"),
+    }
+    app_store = roster_store.read_manifest()
+    try:
+        first = fetch_all(steam_ids, workers=2, rate=100.0, api_url=api_url, **paths)
+        second = fetch_all(steam_ids, workers=2, rate=100.0, api_url=api_url, **paths)
+        deleted = next(name for name in os.listdir(paths["data_dir"]) if name.startswith(steam_ids[0]))
+        os.remove(os.path.join(paths["data_dir"], deleted))
+        third = fetch_all(steam_ids, workers=2, rate=100.0, api_url=api_url, **paths)
+
+        checks = {
+            "erster Lauf lädt alle": sorted(first["updated"]) == steam_ids,
+            "zweiter Lauf nur 304": sorted(second["unchanged"]) == steam_ids,
+            "gelöschte Datei neu geladen": third["updated"] == [steam_ids[0]]
+            and os.path.exists(os.path.join(paths["data_dir"], deleted)),
+            "vorhandene Datei weiter 304": third["unchanged"] == [steam_ids[1]],
+            "Roster-Store der App unberührt": roster_store.read_manifest() == app_store,
+        }
+    finally:
+        server.shutdown()
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+    for check, ok in checks.items():
+        print(f"{'✅' if ok else '❌'} {check}")
+    return all(checks.values())
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Leetify-Profile nach player_data/ laden")
+    parser.add_argument("steam_ids", nargs="*", help="SteamID64s")
+    parser.add_argument("--ids-file", help="Datei mit einer SteamID64 pro Zeile")
+    parser.add_argument("--workers", type=int, default=8)
+    parser.add_argument("--rate", type=float, default=5.0, help="Anfragen pro Sekunde")
+    parser.add_argument("--api-url", default=API_URL)
+    parser.add_argument("--data-dir", default=PLAYER_DATA_DIR)
+    parser.add_argument("--state-file", default=FETCH_STATE_FILE)
+    parser.add_argument("--store-dir", default=roster_store.STORE_DIR, help="Roster-Store zu --data-dir")
+    parser.add_argument("--selftest", action="store_true", help="gegen einen lokalen Stub prüfen und beenden")
+    args = parser.parse_args()
+
+    if args.selftest:
+        raise SystemExit(0 if selftest() else 1)
+
+    steam_ids = list(args.steam_ids)
+    if args.ids_file:
+        with open(args.ids_file, encoding="utf-8") as f:
+            steam_ids += [line.strip() for line in f if line.strip() and not line.startswith("#")]
+    if not steam_ids:
+        # ohne Angabe die vorhandenen Spieler aktualisieren
+        steam_ids = sorted({name.split("-", 1)[0] for name in os.listdir(args.data_dir) if not name.startswith(".")})
+
+    result = fetch_all(steam_ids, args.workers, args.rate, args.api_url, args.data_dir, args.state_file,
+                       store_dir=args.store_dir)
+    print(f"Fertig: {len(result['updated'])} aktualisiert, {len(result['unchanged'])} unverändert, "
+          f"{len(result['failed'])} fehlgeschlagen")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,17 +1,79 @@
+import os
+import threading
+
 import streamlit as st
 
+# nur der Datenstand, ohne pandas: die Seiten importieren ihre schweren Module erst selbst
+from data_manifest import data_version, get_data_date
+from perf import span
+
+# Sekunden zwischen zwei Prüfungen von player_data/ (0 = aus)
+AUTO_REFRESH_SECONDS = int(os.environ.get("LEETIFY_AUTO_REFRESH", "10"))
+# gemeinsamen Frame beim Serverstart im Hintergrund laden (0 = erst beim ersten Seitenaufruf)
+PREWARM = os.environ.get("LEETIFY_PREWARM", "1") == "1"
+
+
+def _prewarm():
+    with span("startup.prewarm"):
+        import stats_page  # noqa: F401 – pandas, plotly und die Loader der Statistik-Seiten
+        from dataset import stats_frame
+        stats_frame(data_version())
+
+
+@st.cache_resource
+def start_prewarm():
+    """Startet das Vorladen genau einmal pro Serverprozess; Sessions warten nicht darauf."""
+    thread = threading.Thread(target=_prewarm, name="leetify-prewarm", daemon=True)
+    thread.start()
+    return thread
+
+
+if PREWARM:
+    start_prewarm()
+
 rating_page = st.Page("rating.py", title="Leetify Rating", icon="📉")
 aim_page = st.Page("aim_stats.py", title="Leetify Aim Rating", icon="💯")
 duell_page = st.Page("duell_stats.py", title="Leetify Duell Rating", icon="🤼")
 trade_page = st.Page("trade_stats.py", title="Leetify Trade Rating", icon="🔄")
 flash_page = st.Page("flash_stats.py", title="Leetify Flash Stats", icon="👨‍🦯")
 he_page = st.Page("he_stats.py", title="IB Leetify HE Stats", icon="💥")
+maps_page = st.Page("maps_stats.py", title="Leetify Maps", icon="🗺️")
+form_page = st.Page("form_stats.py", title="Leetify Form", icon="📈")
+stack_page = st.Page("stack_stats.py", title="Leetify Stack", icon="👥")
+history_page = st.Page("history_stats.py", title="Leetify Verlauf", icon="🕰️")
+similarity_page = st.Page("similarity_stats.py", title="Leetify Ähnlichkeit", icon="🧬")
+team_page = st.Page("team_stats.py", title="Leetify Lineup", icon="🧩")
+ranks_page = st.Page("ranks_stats.py", title="Leetify Ranks", icon="🏅")
+performance_page = st.Page("performance.py", title="Performance", icon="⏱️")
+
+pages = [rating_page, aim_page, duell_page, trade_page, flash_page, he_page, maps_page, form_page, stack_page,
+         history_page, similarity_page, team_page, ranks_page]
+
+# Performance-Seite ist versteckt: freischalten über ?perf=1 oder LEETIFY_PERF_PAGE=1
+if st.query_params.get("perf") == "1" or os.environ.get("LEETIFY_PERF_PAGE") == "1":
+    st.session_state["show_performance"] = True
+if st.session_state.get("show_performance"):
+    pages.append(performance_page)
+
+pg = st.navigation(pages)
+
+data_date = get_data_date()
+data_date_text = data_date.strftime("%d.%m.%Y %H:%M") if data_date else "-"
+st.set_page_config(page_title=f"CS2 Schwanzvergleich dataDate: {data_date_text}", page_icon=":material/edit:")
 
 
-pg = st.navigation([rating_page, aim_page, duell_page, trade_page, flash_page, he_page])
-st.set_page_config(page_title="CS2 Schwanzvergleich dataDate: 30.01.2026 16:00", page_icon=":material/edit:")
+if AUTO_REFRESH_SECONDS:
+    st.session_state.setdefault("data_version", data_version())
 
+    @st.fragment(run_every=AUTO_REFRESH_SECONDS)
+    def watch_player_data():
+        """Startet die Seite neu, sobald sich eine Datei in player_data/ geändert hat."""
+        version = data_version()
+        if version != st.session_state["data_version"]:
+            st.session_state["data_version"] = version
+            st.rerun()
 
+    watch_player_data()
 
 
 pg.run()
@@ -0,0 +1,103 @@
+import pandas as pd
+import streamlit as st
+import plotly.express as px
+
+from data_handling import data_version, load_store_table
+from dataset import player_names
+from match_history import get_map_aggregate
+from perf import cache_call, cache_miss, span
+
+
+ALL_SOURCES = "alle"
+
+
+@st.cache_resource(max_entries=2)
+def load_map_data(version):
+    """Map-Aggregat (plus Summe über alle Quellen) mit Namen und Competitive-Rang, einmal pro Datenstand."""
+    cache_miss("st.load_map_data")
+    aggregate = get_map_aggregate().reset_index()
+    aggregate["rating_sum"] = aggregate["avg_rating"] * aggregate["matches"]
+
+    totals = aggregate.groupby(["steam64_id", "map_name"], as_index=False)[["matches", "wins", "rating_sum"]].sum()
+    totals["data_source"] = ALL_SOURCES
+    totals["avg_rating"] = totals["rating_sum"] / totals["matches"]
+    totals["win_rate"] = totals["wins"] / totals["matches"]
+
+    cube = pd.concat([aggregate, totals], ignore_index=True).drop(columns="rating_sum")
+
+    names = player_names(version)
+    cube["Name"] = cube["steam64_id"].map(names)
+
+    ranks = load_store_table("competitive_ranks")
+    ranks = ranks[ranks["rank"] > 0].rename(columns={"rank": "competitive_rank"})
+    cube = cube.merge(ranks, on=["steam64_id", "map_name"], how="left")
+
+    # Index für Lookups nach Quelle -> Spieler bzw. Quelle -> Map
+    by_player = cube.set_index(["data_source", "Name"]).sort_index()
+    by_map = cube.set_index(["data_source", "map_name"]).sort_index()
+    return by_player, by_map
+
+
+st.title("🗺️Leetify Map Statistiken")
+st.markdown("---")
+
+with span("load", "maps"):
+    cache_call("st.load_map_data")
+    by_player, by_map = load_map_data(data_version())
+
+sources = [ALL_SOURCES, *sorted(set(by_player.index.get_level_values("data_source")) - {ALL_SOURCES})]
+data_source = st.selectbox("Spielmodus:", options=sources)
+
+if by_player.empty:
+    st.warning("Keine Matches in den geladenen Profilen gefunden.")
+    st.stop()
+
+tab_player, tab_map = st.tabs(["Pro Spieler", "Pro Map"])
+
+with tab_player:
+    player_options = sorted(by_player.loc[data_source].index.unique())
+    player = st.selectbox("Spieler:", options=player_options)
+
+    df_player = by_player.loc[[(data_source, player)]].sort_values("matches", ascending=False)
+
+    fig = px.bar(
+        df_player,
+        x="map_name",
+        y="win_rate",
+        color="avg_rating",
+        hover_data=["matches", "wins", "competitive_rank"],
+        title=f"Winrate pro Map: {player}",
+        color_continuous_scale=px.colors.sequential.Turbo
+    )
+    fig.update_layout(xaxis_title="Map", yaxis_title="Winrate", yaxis_tickformat=".0%")
+    with span("render.serialize", "maps"):
+        st.plotly_chart(fig, use_container_width=True)
+
+    st.dataframe(
+        df_player[["map_name", "matches", "wins", "win_rate", "avg_rating", "competitive_rank"]],
+        hide_index=True,
+    )
+
+with tab_map:
+    map_options = sorted(by_map.loc[data_source].index.unique())
+    map_name = st.selectbox("Map:", options=map_options)
+
+    df_map = by_map.loc[[(data_source, map_name)]].sort_values("win_rate", ascending=False)
+
+    fig = px.bar(
+        df_map,
+        x="Name",
+        y="win_rate",
+        color="avg_rating",
+        hover_data=["matches", "wins", "competitive_rank"],
+        title=f"Winrate auf {map_name}",
+        color_continuous_scale=px.colors.sequential.Turbo
+    )
+    fig.update_layout(xaxis_title="Spieler", yaxis_title="Winrate", yaxis_tickformat=".0%")
+    with span("render.serialize", "maps"):
+        st.plotly_chart(fig, use_container_width=True)
+
+    st.dataframe(
+        df_map[["Name", "matches", "wins", "win_rate", "avg_rating", "competitive_rank"]],
+        hide_index=True,
+    )
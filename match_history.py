@@ -0,0 +1,211 @@
+"""Deduplizierter Match-Index über die recent_matches aller Profile.
+
+Spielen mehrere unserer Spieler zusammen, steht dasselbe Match in jedem ihrer
+Profile. Hier landet jedes Match genau einmal in `matches` (Index: Match-ID),
+die spielerbezogenen Werte stehen in der Join-Tabelle `player_matches`.
+"""
+import threading
+
+import pandas as pd
+
+from data_handling import PLAYER_DATA_DIR, diff_manifests, directory_manifest, load_player_file
+from perf import cache_event, span
+
+
+MATCH_COLUMNS = ["finished_at", "map_name", "data_source"]
+
+# Stand des Index: Manifest, Match-Zeilen pro Datei und die zusammengeführten Tabellen
+# "derived" hält daraus abgeleitete Tabellen und wird bei jedem Neuaufbau geleert
+_INDEX = {"manifest": {}, "file_rows": {}, "matches": None, "player_matches": None, "derived": {}}
+# Session-Threads, API und Prewarm teilen _INDEX; Aufbau und abgeleitete Tabellen nur unter dem Lock
+_INDEX_LOCK = threading.RLock()
+
+
+def _match_rows(player):
+    """Alle recent_matches eines Profils als flache Zeilen."""
+    # player ist None, wenn die Datei nicht geladen werden konnte
+    if player is None or not len(player.matches):
+        return pd.DataFrame()
+    return player.matches.frame(player.steam64_id, id_column="match_id")
+
+
+def _build_tables(file_rows):
+    frames = [rows for rows in file_rows.values() if not rows.empty]
+    if not frames:
+        matches = pd.DataFrame(columns=MATCH_COLUMNS, index=pd.Index([], name="match_id"))
+        player_matches = pd.DataFrame(columns=["steam64_id", "match_id"])
+        return matches, player_matches
+
+    all_rows = pd.concat(frames, ignore_index=True)
+    all_rows["finished_at"] = pd.to_datetime(all_rows["finished_at"], utc=True)
+
+    matches = (
+        all_rows.drop_duplicates("match_id")
+        .set_index("match_id")[MATCH_COLUMNS]
+        .sort_values("finished_at")
+    )
+    matches["map_name"] = matches["map_name"].astype("category")
+    matches["data_source"] = matches["data_source"].astype("category")
+
+    player_matches = (
+        all_rows.drop(columns=MATCH_COLUMNS)
+        .drop_duplicates(["steam64_id", "match_id"])
+        .sort_values(["steam64_id", "match_id"], ignore_index=True)
+    )
+    return matches, player_matches
+
+
+def get_match_index(data_dir=PLAYER_DATA_DIR):
+    """Liefert (matches, player_matches). Nur geänderte Profildateien werden neu eingelesen."""
+    with _INDEX_LOCK:
+        manifest = directory_manifest(data_dir)
+        hit = _INDEX["matches"] is not None and manifest == _INDEX["manifest"]
+        cache_event("match_index", hit)
+        if hit:
+            return _INDEX["matches"], _INDEX["player_matches"]
+
+        added, modified, removed = diff_manifests(_INDEX["manifest"], manifest)
+        file_rows = dict(_INDEX["file_rows"])
+        for name in removed:
+            file_rows.pop(name, None)
+        with span("extract.match_index"):
+            for name in added + modified:
+                file_rows[name] = _match_rows(load_player_file(name, data_dir))
+            matches, player_matches = _build_tables(file_rows)
+
+        _INDEX.update(manifest=manifest, file_rows=file_rows, matches=matches, player_matches=player_matches,
+                      derived={})
+        return matches, player_matches
+
+
+def get_player_match_frame(data_dir=PLAYER_DATA_DIR):
+    """Join-Tabelle inklusive der Match-Spalten (Datum, Map, Quelle)."""
+    matches, player_matches = get_match_index(data_dir)
+    return player_matches.join(matches, on="match_id")
+
+
+def _utc(timestamp):
+    timestamp = pd.Timestamp(timestamp)
+    return timestamp.tz_localize("UTC") if timestamp.tzinfo is None else timestamp.tz_convert("UTC")
+
+
+def query_matches(map_name=None, since=None, until=None, steam64_id=None, data_dir=PLAYER_DATA_DIR):
+    """Matches gefiltert nach Map, Zeitraum und/oder Spieler, sortiert nach Datum.
+
+    Beispiel: query_matches("de_inferno", since="2026-01-01")
+    """
+    matches, player_matches = get_match_index(data_dir)
+
+    # matches ist nach finished_at sortiert, der Zeitraum ist daher nur eine Binärsuche
+    finished = matches["finished_at"]
+    start = 0 if since is None else finished.searchsorted(_utc(since), side="left")
+    stop = len(matches) if until is None else finished.searchsorted(_utc(until), side="right")
+    result = matches.iloc[start:stop]
+
+    if map_name is not None:
+        result = result[result["map_name"] == map_name]
+
+    if steam64_id is not None:
+        # player_matches ist nach SteamID sortiert
+        steam_ids = player_matches["steam64_id"]
+        lo = steam_ids.searchsorted(steam64_id, side="left")
+        hi = steam_ids.searchsorted(steam64_id, side="right")
+        result = result[result.index.isin(player_matches["match_id"].iloc[lo:hi])]
+
+    return result
+
+
+def get_map_aggregate(data_dir=PLAYER_DATA_DIR):
+    """Spieler × Map × Quelle: Anzahl Matches, Siege, Winrate und durchschnittliches Rating.
+
+    Wird einmal pro Datenstand berechnet; der Index (steam64_id, map_name, data_source)
+    ist sortiert, Abfragen für einen Spieler oder eine Map sind damit reine Lookups.
+    """
+    with _INDEX_LOCK:
+        get_match_index(data_dir)
+        if "map_aggregate" in _INDEX["derived"]:
+            return _INDEX["derived"]["map_aggregate"]
+
+        frame = get_player_match_frame(data_dir)
+        frame = frame.assign(
+            win=(frame["outcome"] == "win").astype(int),
+            map_name=frame["map_name"].astype(str),
+            data_source=frame["data_source"].astype(str),
+        )
+        aggregate = frame.groupby(["steam64_id", "map_name", "data_source"]).agg(
+            matches=("match_id", "size"),
+            wins=("win", "sum"),
+            avg_rating=("leetify_rating", "mean"),
+        )
+        aggregate["win_rate"] = aggregate["wins"] / aggregate["matches"]
+
+        _INDEX["derived"]["map_aggregate"] = aggregate.sort_index()
+        return _INDEX["derived"]["map_aggregate"]
+
+
+FORM_WINDOWS = (10, 20, 50)
+
+
+def get_rating_form(data_dir=PLAYER_DATA_DIR):
+    """Matches pro Spieler chronologisch mit gleitenden Rating-Mitteln (rolling_10, rolling_20, ...).
+
+    Index ist finished_at, alle Fenster werden vektorisiert über groupby().rolling() berechnet.
+    """
+    with _INDEX_LOCK:
+        get_match_index(data_dir)
+        if "rating_form" in _INDEX["derived"]:
+            return _INDEX["derived"]["rating_form"]
+
+        frame = get_player_match_frame(data_dir)
+        frame = frame[["steam64_id", "finished_at", "map_name", "outcome", "leetify_rating"]]
+        frame = frame.sort_values(["steam64_id", "finished_at"]).set_index("finished_at")
+
+        grouped = frame.groupby("steam64_id")["leetify_rating"]
+        for window in FORM_WINDOWS:
+            rolling = grouped.rolling(window, min_periods=1).mean()
+            # groupby().rolling() hängt steam64_id als Level an; Reihenfolge ist identisch zu frame
+            frame[f"rolling_{window}"] = rolling.to_numpy()
+        frame["match_number"] = frame.groupby("steam64_id").cumcount() + 1
+
+        _INDEX["derived"]["rating_form"] = frame
+        return frame
+
+
+def get_form_summary(data_dir=PLAYER_DATA_DIR):
+    """Pro Spieler: Trend (Steigung des Ratings pro Match), aktuelle Serie und längste Siegesserie."""
+    with _INDEX_LOCK:
+        get_match_index(data_dir)
+        if "form_summary" in _INDEX["derived"]:
+            return _INDEX["derived"]["form_summary"]
+
+        frame = get_rating_form(data_dir).reset_index()
+        steam_ids = frame["steam64_id"]
+
+        # Steigung der linearen Regression rating ~ match_number, über Gruppensummen statt Schleifen;
+        # Matches ohne Rating fallen aus allen Summen heraus, nicht nur aus y und xy
+        rated = frame[frame["leetify_rating"].notna()]
+        x = rated["match_number"].astype(float)
+        y = rated["leetify_rating"]
+        sums = pd.DataFrame({"n": 1, "x": x, "y": y, "xx": x * x, "xy": x * y, "steam64_id": rated["steam64_id"]}) \
+            .groupby("steam64_id").sum()
+        denominator = sums["n"] * sums["xx"] - sums["x"] ** 2
+        trend = (sums["n"] * sums["xy"] - sums["x"] * sums["y"]) / denominator.where(denominator != 0)
+
+        # Serien: neue Serie, sobald Spieler oder Ergebnis wechseln
+        run_id = ((frame["outcome"] != frame["outcome"].shift()) | (steam_ids != steam_ids.shift())).cumsum()
+        run_length = frame.groupby(run_id).cumcount() + 1
+        last = frame.assign(run_length=run_length).groupby("steam64_id").tail(1).set_index("steam64_id")
+        longest_win = run_length[frame["outcome"] == "win"].groupby(steam_ids).max()
+
+        summary = pd.DataFrame({
+            "matches": steam_ids.value_counts(),
+            "trend_per_match": trend,
+            "current_streak": last["run_length"],
+            "current_streak_outcome": last["outcome"],
+            "longest_win_streak": longest_win,
+            **{f"last_{window}": last[f"rolling_{window}"] for window in FORM_WINDOWS},
+        })
+        summary["longest_win_streak"] = summary["longest_win_streak"].fillna(0).astype(int)
+
+        _INDEX["derived"]["form_summary"] = summary
+        return summary
@@ -0,0 +1,95 @@
+"""Zentrale Beschreibung aller Statistik-Seiten und ihrer Metriken.
+
+Jede Metrik hat:
+    column       Spaltenname im DataFrame / auf der Seite
+    source       Pfad in der flachen Profiltabelle (z.B. "stats.flashbang_thrown"),
+                 bei einer Liste von Pfaden wird der Mittelwert gebildet
+    scale        Faktor beim Extrahieren (optional, Standard 1)
+    radar_scale  Faktor nur für das Radar-Chart (optional, Standard 1)
+    radar        ob die Metrik im Radar/den Bar Charts auftaucht (optional, Standard True)
+    higher_is_better  False für Metriken, bei denen weniger besser ist (optional, Standard True)
+"""
+
+PAGES = {
+    "rating": {
+        "title": "📉Leetify Rating Statistiken",
+        "radar_range": [0, 100],
+        "metrics": [
+            {"column": "Aim_Rating", "source": "rating.aim"},
+            {"column": "Utility_Rating", "source": "rating.utility"},
+            {"column": "Opening_Kill_Success", "source": "rating.opening", "scale": 1000},
+            {"column": "Clutch_Percentage", "source": "rating.clutch", "radar_scale": 100},
+            {"column": "Positioning_Rating", "source": "rating.positioning"},
+            {"column": "Leetify_Rating", "source": ["rating.ct_leetify", "rating.t_leetify"], "radar": False},
+            {"column": "Headshot_Percentage", "source": "stats.accuracy_head", "radar": False},
+        ],
+        "highlight": {
+            "column": "Leetify_Rating",
+            "title": "Vergleich des Leetify Ratings",
+            "label": "Leetify Rating",
+            "description": "Erlaeuterung: Der Leetify Score ist ein komplexer, kontextbezogener Spieler-Rating-Wert, "
+                           "der speziell mentwickelt wurde, um den tatsächlichen Einfluss (Impact) eines Spielers auf "
+                           "den Ausgang einer Runde oder eines Matches in CS:GO/CS2 genauer zu messen. "
+                           "Formel: (ct-leetify rating + t-leetify rating) / 2 ",
+        },
+    },
+    "aim": {
+        "title": "💯Leetify Aim Statistiken",
+        "metrics": [
+            {"column": "accuracy_enemy_spotted", "source": "stats.accuracy_enemy_spotted"},
+            {"column": "counter_strafing_good_shots_ratio", "source": "stats.counter_strafing_good_shots_ratio"},
+            {"column": "reaction_time_ms", "source": "stats.reaction_time_ms", "higher_is_better": False},
+            {"column": "spray_accuracy", "source": "stats.spray_accuracy"},
+            {"column": "preaim", "source": "stats.preaim"},
+        ],
+    },
+    "duell": {
+        "title": "🤼Leetify Duell Statistiken",
+        "metrics": [
+            {"column": "ct_opening_aggression_success_rate", "source": "stats.ct_opening_aggression_success_rate"},
+            {"column": "ct_opening_duel_success_percentage", "source": "stats.ct_opening_duel_success_percentage"},
+            {"column": "t_opening_aggression_success_rate", "source": "stats.t_opening_aggression_success_rate"},
+            {"column": "t_opening_duel_success_percentage", "source": "stats.t_opening_duel_success_percentage"},
+        ],
+    },
+    "trade": {
+        "title": "🔄 IronBlow Leetify Trade Statistiken",
+        "metrics": [
+            {"column": "traded_deaths_success_percentage", "source": "stats.traded_deaths_success_percentage"},
+            {"column": "trade_kill_opportunities_per_round", "source": "stats.trade_kill_opportunities_per_round"},
+            {"column": "trade_kills_success_percentage", "source": "stats.trade_kills_success_percentage"},
+        ],
+    },
+    "flash": {
+        "title": "👨‍🦯Leetify Flash Granate Statistiken",
+        "metrics": [
+            {"column": "flashbang_hit_foe_avg_duration", "source": "stats.flashbang_hit_foe_avg_duration"},
+            {"column": "flashbang_hit_foe_per_flashbang", "source": "stats.flashbang_hit_foe_per_flashbang"},
+            {"column": "flashbang_hit_friend_per_flashbang", "source": "stats.flashbang_hit_friend_per_flashbang",
+             "higher_is_better": False},
+            {"column": "flashbang_leading_to_kill", "source": "stats.flashbang_leading_to_kill"},
+            {"column": "flashbang_thrown", "source": "stats.flashbang_thrown"},
+        ],
+    },
+    "he": {
+        "title": "💥Leetify Granate Statistiken",
+        "metrics": [
+            {"column": "he_foes_damage_avg", "source": "stats.he_foes_damage_avg"},
+            {"column": "he_friends_damage_avg", "source": "stats.he_friends_damage_avg", "higher_is_better": False},
+            {"column": "utility_on_death_avg", "source": "stats.utility_on_death_avg", "higher_is_better": False},
+        ],
+    },
+}
+
+
+def all_metrics():
+    """Alle Metriken aller Seiten in Registry-Reihenfolge."""
+    return [metric for page in PAGES.values() for metric in page["metrics"]]
+
+
+def page_columns(page_key):
+    return [metric["column"] for metric in PAGES[page_key]["metrics"]]
+
+
+def radar_metrics(page_key):
+    return [metric for metric in PAGES[page_key]["metrics"] if metric.get("radar", True)]
@@ -0,0 +1,110 @@
+"""Zeitmessung der heißen Pfade (load, extract, transform, render) und Cache-Trefferquoten.
+
+    with span("load", page="aim"):
+        ...
+
+Die Messwerte liegen prozessweit in einem Ringpuffer und werden auf der
+Performance-Seite ausgewertet. Ist LEETIFY_PERF_LOG gesetzt, wird jede Messung
+zusätzlich als JSON-Zeile an diese Datei angehängt.
+"""
+import json
+import os
+import threading
+import time
+from collections import defaultdict, deque
+from contextlib import contextmanager
+
+
+MAX_SPANS = 10000
+PERF_LOG = os.environ.get("LEETIFY_PERF_LOG")
+
+_SPANS = deque(maxlen=MAX_SPANS)
+_CACHE_CALLS = defaultdict(int)
+_CACHE_MISSES = defaultdict(int)
+_LOCK = threading.Lock()
+
+
+@contextmanager
+def span(stage, page=None, **details):
+    """Misst die Dauer des Blocks und legt sie unter (page, stage) ab."""
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        record = {
+            "ts": time.time(),
+            "page": page or "-",
+            "stage": stage,
+            "duration_ms": (time.perf_counter() - start) * 1000,
+            **details,
+        }
+        with _LOCK:
+            _SPANS.append(record)
+            if PERF_LOG:
+                with open(PERF_LOG, "a", encoding="utf-8") as f:
+                    f.write(json.dumps(record) + "\n")
+
+
+def cache_call(name):
+    """Zählt einen Zugriff auf einen Cache."""
+    with _LOCK:
+        _CACHE_CALLS[name] += 1
+
+
+def cache_miss(name):
+    """Zählt einen Cache-Miss (innerhalb der gecachten Funktion aufrufen)."""
+    with _LOCK:
+        _CACHE_MISSES[name] += 1
+
+
+def cache_event(name, hit):
+    cache_call(name)
+    if not hit:
+        cache_miss(name)
+
+
+def spans():
+    with _LOCK:
+        return list(_SPANS)
+
+
+def stage_summary():
+    """Latenz-Perzentile pro Seite und Stufe."""
+    # erst hier importieren: perf wird überall importiert und soll den Start nicht bremsen
+    import numpy as np
+    import pandas as pd
+
+    records = spans()
+    if not records:
+        return pd.DataFrame(columns=["page", "stage", "count", "p50_ms", "p90_ms", "p99_ms", "max_ms"])
+
+    df = pd.DataFrame(records)
+    rows = []
+    for (page, stage), durations in df.groupby(["page", "stage"])["duration_ms"]:
+        p50, p90, p99 = np.percentile(durations, [50, 90, 99])
+        rows.append({
+            "page": page, "stage": stage, "count": len(durations),
+            "p50_ms": p50, "p90_ms": p90, "p99_ms": p99, "max_ms": durations.max(),
+        })
+    return pd.DataFrame(rows)
+
+
+def cache_summary():
+    """Zugriffe, Misses und Trefferquote pro Cache."""
+    import pandas as pd
+
+    with _LOCK:
+        calls, misses = dict(_CACHE_CALLS), dict(_CACHE_MISSES)
+    rows = [
+        {"cache": name, "calls": count, "misses": misses.get(name, 0),
+         "hit_rate": 1 - min(misses.get(name, 0), count) / count}
+        for name, count in sorted(calls.items())
+    ]
+    return pd.DataFrame(rows, columns=["cache", "calls", "misses", "hit_rate"])
+
+
+def reset():
+    with _LOCK:
+        _SPANS.clear()
+        _CACHE_CALLS.clear()
+        _CACHE_MISSES.clear()
@@ -0,0 +1,32 @@
+import json
+
+import streamlit as st
+
+from perf import PERF_LOG, cache_summary, reset, spans, stage_summary
+
+
+st.title("⏱️Performance")
+st.markdown("Latenzen pro Seite und Stufe (load, extract, transform, render) seit dem Start dieses Prozesses.")
+
+if PERF_LOG:
+    st.caption(f"Messungen werden zusätzlich nach `{PERF_LOG}` geschrieben.")
+
+st.subheader("Latenz-Perzentile (ms)")
+st.dataframe(stage_summary().round(2), hide_index=True)
+
+st.subheader("Cache-Trefferquoten")
+st.dataframe(cache_summary(), hide_index=True, column_config={
+    "hit_rate": st.column_config.ProgressColumn("hit_rate", min_value=0.0, max_value=1.0, format="percent"),
+})
+
+records = spans()
+col_download, col_reset = st.columns(2)
+col_download.download_button(
+    "Messungen als JSON Lines",
+    data="\n".join(json.dumps(record) for record in records),
+    file_name="leetify_perf.jsonl",
+    mime="application/jsonl",
+)
+if col_reset.button("Zurücksetzen"):
+    reset()
+    st.rerun()
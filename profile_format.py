@@ -0,0 +1,358 @@
+"""Versioniertes, validiertes Profilformat (MessagePack über msgspec) statt roher Pickles.
+
+Eine Datei player_data/<steam64_id>-<name>.msgpack enthält (version, profile).
+Beim Schreiben und beim Lesen wird gegen die Structs unten validiert; Felder, die
+Leetify zusätzlich liefert, werden ignoriert. Blöcke und Listen, die Leetify als
+explizites null schickt, ersetzt __post_init__ durch den leeren Standardwert. Auch
+einzelne Werte in Matches, Teammates und Competitive-Rängen dürfen null sein; Zeilen
+ohne ihre Schlüsselfelder (*_KEY_FIELDS) lässt profile_model weg, profile_quality
+meldet sie als fehlend.
+
+Seit Format v2 stehen Matches, Teammates und Competitive-Ränge als Arrays statt als
+Maps in der Datei (die Feldnamen wiederholen sich nicht mehr in jeder Zeile) und
+Standardwerte werden weggelassen; v1-Dateien werden weiter gelesen.
+
+Bestehende Pickles umwandeln und v1-Dateien auf das aktuelle Format bringen:
+    python profile_format.py                  # wandelt um und löscht die Pickles
+    python profile_format.py --keep-pickles
+"""
+import argparse
+import io
+import os
+import pickle
+import tempfile
+from typing import Optional
+
+import msgspec
+
+
+FORMAT_VERSION = 2
+PROFILE_SUFFIX = ".msgpack"
+
+
+class Rating(msgspec.Struct):
+    aim: Optional[float] = None
+    positioning: Optional[float] = None
+    utility: Optional[float] = None
+    clutch: Optional[float] = None
+    opening: Optional[float] = None
+    ct_leetify: Optional[float] = None
+    t_leetify: Optional[float] = None
+
+
+class Stats(msgspec.Struct):
+    accuracy_enemy_spotted: Optional[float] = None
+    accuracy_head: Optional[float] = None
+    counter_strafing_good_shots_ratio: Optional[float] = None
+    ct_opening_aggression_success_rate: Optional[float] = None
+    ct_opening_duel_success_percentage: Optional[float] = None
+    flashbang_hit_foe_avg_duration: Optional[float] = None
+    flashbang_hit_foe_per_flashbang: Optional[float] = None
+    flashbang_hit_friend_per_flashbang: Optional[float] = None
+    flashbang_leading_to_kill: Optional[float] = None
+    flashbang_thrown: Optional[float] = None
+    he_foes_damage_avg: Optional[float] = None
+    he_friends_damage_avg: Optional[float] = None
+    preaim: Optional[float] = None
+    reaction_time_ms: Optional[float] = None
+    spray_accuracy: Optional[float] = None
+    t_opening_aggression_success_rate: Optional[float] = None
+    t_opening_duel_success_percentage: Optional[float] = None
+    trade_kill_opportunities_per_round: Optional[float] = None
+    trade_kills_success_percentage: Optional[float] = None
+    traded_deaths_success_percentage: Optional[float] = None
+    utility_on_death_avg: Optional[float] = None
+
+
+# ohne diese Felder lässt sich eine Zeile keiner Map, keinem Match bzw. keinem Spieler zuordnen
+RANK_KEY_FIELDS = ("map_name",)
+MATCH_KEY_FIELDS = ("id", "finished_at", "map_name", "outcome")
+TEAMMATE_KEY_FIELDS = ("steam64_id",)
+
+
+class CompetitiveRank(msgspec.Struct):
+    map_name: Optional[str] = None
+    rank: Optional[int] = None
+
+
+class Ranks(msgspec.Struct):
+    leetify: Optional[float] = None
+    premier: Optional[int] = None
+    faceit: Optional[int] = None
+    faceit_elo: Optional[int] = None
+    wingman: Optional[int] = None
+    renown: Optional[int] = None
+    competitive: Optional[list[CompetitiveRank]] = None
+
+    def __post_init__(self):
+        if self.competitive is None:
+            self.competitive = []
+
+
+class RecentMatch(msgspec.Struct):
+    id: Optional[str] = None
+    finished_at: Optional[str] = None
+    map_name: Optional[str] = None
+    outcome: Optional[str] = None
+    data_source: Optional[str] = None
+    leetify_rating: Optional[float] = None
+    score: Optional[list[Optional[int]]] = None
+    rank: Optional[int] = None
+    rank_type: Optional[int] = None
+    preaim: Optional[float] = None
+    reaction_time_ms: Optional[float] = None
+    accuracy_enemy_spotted: Optional[float] = None
+    accuracy_head: Optional[float] = None
+    spray_accuracy: Optional[float] = None
+
+    def __post_init__(self):
+        if self.score is None:
+            self.score = []
+
+
+class Teammate(msgspec.Struct):
+    steam64_id: Optional[str] = None
+    recent_matches_count: Optional[int] = 0
+
+
+_EMPTY_PROFILE_FIELDS = {
+    "bans": list, "ranks": Ranks, "rating": Rating, "stats": Stats,
+    "recent_matches": list, "recent_teammates": list,
+}
+
+
+class Profile(msgspec.Struct):
+    steam64_id: str
+    name: Optional[str] = None
+    id: Optional[str] = None
+    privacy_mode: Optional[str] = None
+    winrate: Optional[float] = None
+    total_matches: Optional[int] = None
+    first_match_date: Optional[str] = None
+    bans: Optional[list[dict]] = None
+    ranks: Optional[Ranks] = None
+    rating: Optional[Rating] = None
+    stats: Optional[Stats] = None
+    recent_matches: Optional[list[RecentMatch]] = None
+    recent_teammates: Optional[list[Teammate]] = None
+
+    def __post_init__(self):
+        # null oder fehlend: leerer Block bzw. leere Liste, damit die Leser nie None sehen
+        for field, empty in _EMPTY_PROFILE_FIELDS.items():
+            if getattr(self, field) is None:
+                setattr(self, field, empty())
+
+
+class ProfileFile(msgspec.Struct):
+    """Hülle im Format v1: alle Structs als Maps."""
+    version: int
+    profile: Profile
+
+
+# Speicherform ab v2. Die Klassen erben Felder und __post_init__ von den Schema-Structs,
+# Leser bekommen also weiterhin Profile, RecentMatch usw.; API-Antworten (Maps) werden
+# gegen die Schema-Structs validiert, denn array_like-Structs nehmen nur Arrays an.
+class _StoredCompetitiveRank(CompetitiveRank, array_like=True, omit_defaults=True):
+    pass
+
+
+class _StoredRanks(Ranks, omit_defaults=True):
+    competitive: Optional[list[_StoredCompetitiveRank]] = None
+
+
+class _StoredRating(Rating, omit_defaults=True):
+    pass
+
+
+class _StoredStats(Stats, omit_defaults=True):
+    pass
+
+
+class _StoredMatch(RecentMatch, array_like=True, omit_defaults=True):
+    pass
+
+
+class _StoredTeammate(Teammate, array_like=True, omit_defaults=True):
+    pass
+
+
+class _StoredProfile(Profile, omit_defaults=True):
+    ranks: Optional[_StoredRanks] = None
+    rating: Optional[_StoredRating] = None
+    stats: Optional[_StoredStats] = None
+    recent_matches: Optional[list[_StoredMatch]] = None
+    recent_teammates: Optional[list[_StoredTeammate]] = None
+
+
+class _StoredFile(msgspec.Struct):
+    version: int
+    profile: _StoredProfile
+
+
+class _Version(msgspec.Struct):
+    version: int
+
+
+_ENCODER = msgspec.msgpack.Encoder()
+_DECODER = msgspec.msgpack.Decoder(_StoredFile)
+_V1_DECODER = msgspec.msgpack.Decoder(ProfileFile)
+_VERSION_DECODER = msgspec.msgpack.Decoder(_Version)
+
+
+# Klassen je Ebene: Schema (Maps wie in der API) und Speicherform
+_SCHEMA_TYPES = {"profile": Profile, "ranks": Ranks, "competitive": CompetitiveRank, "rating": Rating,
+                 "stats": Stats, "recent_matches": RecentMatch, "recent_teammates": Teammate}
+_STORED_TYPES = {"profile": _StoredProfile, "ranks": _StoredRanks, "competitive": _StoredCompetitiveRank,
+                 "rating": _StoredRating, "stats": _StoredStats, "recent_matches": _StoredMatch,
+                 "recent_teammates": _StoredTeammate}
+
+
+def _as(types, key, struct):
+    return types[key](*msgspec.structs.astuple(struct))
+
+
+def _convert_profile(profile, types):
+    """Dasselbe Profil in den Klassen aus types (Schema oder Speicherform)."""
+    ranks = profile.ranks
+    return msgspec.structs.replace(
+        _as(types, "profile", profile),
+        ranks=msgspec.structs.replace(
+            _as(types, "ranks", ranks),
+            competitive=[_as(types, "competitive", rank) for rank in ranks.competitive],
+        ),
+        rating=_as(types, "rating", profile.rating),
+        stats=_as(types, "stats", profile.stats),
+        recent_matches=[_as(types, "recent_matches", match) for match in profile.recent_matches],
+        recent_teammates=[_as(types, "recent_teammates", mate) for mate in profile.recent_teammates],
+    )
+
+
+def profile_dict(profile):
+    """Ein Profil als dict wie aus der API (auch für gelesene Dateien, deren Matches als Arrays vorliegen)."""
+    return msgspec.to_builtins(_convert_profile(profile, _SCHEMA_TYPES))
+
+
+def validate_profile(data):
+    """Prüft ein Profil (dict, z.B. aus der API oder einem Pickle) gegen das Schema."""
+    return msgspec.convert(data, Profile)
+
+
+def encode_profile(data):
+    profile = data if isinstance(data, Profile) else validate_profile(data)
+    return _ENCODER.encode(_StoredFile(version=FORMAT_VERSION, profile=_convert_profile(profile, _STORED_TYPES)))
+
+
+def file_version(raw):
+    """Formatversion einer Profildatei, ohne das Profil zu validieren."""
+    return _VERSION_DECODER.decode(raw).version
+
+
+def decode_profile(raw):
+    """Dekodiert und validiert eine Profildatei zu einem Profile."""
+    try:
+        profile_file = _DECODER.decode(raw)
+    except msgspec.ValidationError:
+        version = file_version(raw)
+        if version > FORMAT_VERSION:
+            raise ValueError(f"Profilformat v{version} ist neuer als unterstützt (v{FORMAT_VERSION})") from None
+        if version != 1:
+            raise
+        profile_file = _V1_DECODER.decode(raw)
+    if profile_file.version > FORMAT_VERSION:
+        raise ValueError(f"Profilformat v{profile_file.version} ist neuer als unterstützt (v{FORMAT_VERSION})")
+    return profile_file.profile
+
+
+def read_profile(path):
+    """Liest eine .msgpack-Datei oder ein altes Pickle als validiertes Profile."""
+    if not path.endswith(PROFILE_SUFFIX):
+        return validate_profile(read_legacy_pickle(path))
+    with open(path, "rb") as f:
+        return decode_profile(f.read())
+
+
+def write_profile(path, data):
+    """Schreibt ein Profil atomar; die tmp-Datei beginnt mit einem Punkt und wird vom Loader ignoriert."""
+    raw = encode_profile(data)
+    fd, tmp_path = tempfile.mkstemp(prefix=".", dir=os.path.dirname(path) or ".")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(raw)
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+
+
+class _DataOnlyUnpickler(pickle.Unpickler):
+    """Lässt nur eingebaute Datentypen zu; Pickles mit Klassen/Funktionen werden abgelehnt."""
+
+    def find_class(self, module, name):
+        raise pickle.UnpicklingError(f"Unerlaubter Typ im Profil-Pickle: {module}.{name}")
+
+
+def read_legacy_pickle(path):
+    """Liest ein altes Profil-Pickle, ohne beliebigen Code ausführen zu können."""
+    with open(path, "rb") as f:
+        return _DataOnlyUnpickler(io.BytesIO(f.read())).load()
+
+
+def convert_pickles(data_dir, keep_pickles=False):
+    """Wandelt alle Pickles in data_dir in .msgpack um. Liefert (umgewandelt, fehlerhaft)."""
+    converted, failed = [], {}
+    for file_name in sorted(os.listdir(data_dir)):
+        if file_name.startswith(".") or file_name.endswith(PROFILE_SUFFIX):
+            continue
+        path = os.path.join(data_dir, file_name)
+        try:
+            write_profile(path + PROFILE_SUFFIX, read_legacy_pickle(path))
+        except Exception as e:
+            failed[file_name] = f"{type(e).__name__}: {e}"
+            continue
+        if not keep_pickles:
+            os.remove(path)
+        converted.append(file_name)
+    return converted, failed
+
+
+def upgrade_profiles(data_dir):
+    """Schreibt .msgpack-Dateien älterer Formatversionen neu. Liefert (aktualisiert, fehlerhaft)."""
+    upgraded, failed = [], {}
+    for file_name in sorted(os.listdir(data_dir)):
+        if file_name.startswith(".") or not file_name.endswith(PROFILE_SUFFIX):
+            continue
+        path = os.path.join(data_dir, file_name)
+        try:
+            with open(path, "rb") as f:
+                raw = f.read()
+            if file_version(raw) >= FORMAT_VERSION:
+                continue
+            write_profile(path, decode_profile(raw))
+        except Exception as e:
+            failed[file_name] = f"{type(e).__name__}: {e}"
+            continue
+        upgraded.append(file_name)
+    return upgraded, failed
+
+
+def main():
+    from data_handling import PLAYER_DATA_DIR
+
+    parser = argparse.ArgumentParser(description="Profil-Pickles und ältere .msgpack-Dateien in das aktuelle Format umwandeln")
+    parser.add_argument("--data-dir", default=PLAYER_DATA_DIR)
+    parser.add_argument("--keep-pickles", action="store_true", help="Pickles nach dem Umwandeln behalten")
+    args = parser.parse_args()
+
+    converted, failed = convert_pickles(args.data_dir, args.keep_pickles)
+    upgraded, upgrade_failed = upgrade_profiles(args.data_dir)
+    failed.update(upgrade_failed)
+    for file_name in converted:
+        print(f"✅ Umgewandelt: {file_name}")
+    for file_name in upgraded:
+        print(f"✅ Auf Format v{FORMAT_VERSION} gebracht: {file_name}")
+    for file_name, error in failed.items():
+        print(f"❌ Fehler bei {file_name}: {error}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,199 @@
+"""Kompaktes In-Memory-Modell eines Profils.
+
+Statt verschachtelter dicts (pro Match ein dict mit denselben Schlüsseln und einer
+UUID als String) hält ein PlayerProfile die Skalare in slotted dataclasses und die
+recent_matches spaltenweise: NumPy-Arrays, Map-Name/Ergebnis/Quelle als Codes auf
+wenige internierte Strings und Match-IDs als 16-Byte-UUIDs.
+
+Die Extraktoren greifen über flat() (rating.aim, stats.preaim, ranks.faceit_elo, ...)
+und MatchList.frame() bzw. TeammateList.frame() zu.
+"""
+import sys
+import uuid
+from dataclasses import dataclass, make_dataclass
+
+import msgspec
+import numpy as np
+import pandas as pd
+
+import profile_format
+
+
+def _scalar_block(name, fields):
+    # gleiche Felder wie das Struct im Dateiformat, aber ohne Validierungs-Overhead
+    block = make_dataclass(name, fields, slots=True, frozen=True)
+    block.__module__ = __name__
+    return block
+
+
+RANK_FIELDS = tuple(field for field in profile_format.Ranks.__struct_fields__ if field != "competitive")
+
+Rating = _scalar_block("Rating", profile_format.Rating.__struct_fields__)
+Stats = _scalar_block("Stats", profile_format.Stats.__struct_fields__)
+Ranks = _scalar_block("Ranks", RANK_FIELDS)
+
+# Match-Spalten nach Speicherform; Ganzzahlen mit None landen als NaN in float64
+MATCH_CODED_FIELDS = ("map_name", "outcome", "data_source")
+MATCH_FLOAT_FIELDS = ("leetify_rating", "rank", "rank_type", "preaim", "reaction_time_ms",
+                      "accuracy_enemy_spotted", "accuracy_head", "spray_accuracy")
+
+def _complete(rows, key_fields):
+    """Nur Zeilen, bei denen keines der Schlüsselfelder fehlt (siehe profile_format.*_KEY_FIELDS)."""
+    return [row for row in rows if all(getattr(row, field) is not None for field in key_fields)]
+
+
+def _encode_strings(values):
+    """(internierte Kategorien, uint8-Codes); die Kategorien liegen beim Profil, damit
+    das Modell auch aus einem Worker-Prozess zurückgegeben werden kann."""
+    categories = {}
+    codes = np.array([categories.setdefault(value, len(categories)) for value in values], dtype=np.uint8)
+    return tuple(sys.intern(value) for value in categories), codes
+
+
+def _decode_strings(encoded):
+    categories, codes = encoded
+    return [categories[code] for code in codes]
+
+
+def _pack_ids(ids):
+    """Match-IDs als 16 Byte pro Match; IDs, die keine UUID sind, bleiben als Strings erhalten."""
+    try:
+        packed = bytes.fromhex("".join(ids).replace("-", ""))
+    except ValueError:
+        packed = None
+    if packed is None or len(packed) != 16 * len(ids) or any(len(match_id) != 36 for match_id in ids):
+        return tuple(ids)
+    return packed
+
+
+def _unpack_ids(ids):
+    if isinstance(ids, tuple):
+        return list(ids)
+    return [str(uuid.UUID(bytes=ids[offset:offset + 16])) for offset in range(0, len(ids), 16)]
+
+
+def _float_array(values):
+    # None wird dabei zu NaN
+    return np.array(values, dtype=np.float64)
+
+
+@dataclass(slots=True, frozen=True)
+class MatchList:
+    """recent_matches als parallele Arrays, eine Position pro Match."""
+    ids: object
+    finished_at: np.ndarray
+    codes: dict
+    floats: dict
+    score: np.ndarray
+
+    @classmethod
+    def from_structs(cls, matches):
+        return cls(
+            ids=_pack_ids([match.id for match in matches]),
+            finished_at=np.array([match.finished_at.rstrip("Z") for match in matches], dtype="datetime64[ms]"),
+            codes={field: _encode_strings([getattr(match, field) or "" for match in matches])
+                   for field in MATCH_CODED_FIELDS},
+            floats={field: _float_array([getattr(match, field) for match in matches]) for field in MATCH_FLOAT_FIELDS},
+            # score als [team, gegner], fehlende Werte als -1
+            score=np.array([[-1 if value is None else value for value in (match.score + [-1, -1])[:2]]
+                            for match in matches], dtype=np.int16).reshape(-1, 2),
+        )
+
+    def __len__(self):
+        return len(self.finished_at)
+
+    def frame(self, steam64_id, id_column="id"):
+        """Eine Zeile pro Match, Spalten wie bisher in recent_matches plus score_team/score_opponent."""
+        score = self.score.astype(np.float64)
+        score[score < 0] = np.nan
+        columns = {
+            "steam64_id": [steam64_id] * len(self),
+            id_column: _unpack_ids(self.ids),
+            "finished_at": pd.to_datetime(self.finished_at, utc=True),
+            **{field: _decode_strings(encoded) for field, encoded in self.codes.items()},
+            **self.floats,
+            "score_team": score[:, 0],
+            "score_opponent": score[:, 1],
+        }
+        return pd.DataFrame(columns)
+
+
+@dataclass(slots=True, frozen=True)
+class TeammateList:
+    steam64_ids: np.ndarray
+    recent_matches_count: np.ndarray
+
+    @classmethod
+    def from_structs(cls, teammates):
+        return cls(
+            steam64_ids=np.array([int(mate.steam64_id) for mate in teammates], dtype=np.uint64),
+            recent_matches_count=np.array([mate.recent_matches_count or 0 for mate in teammates], dtype=np.int32),
+        )
+
+    def frame(self, steam64_id):
+        return pd.DataFrame({
+            "steam64_id": [steam64_id] * len(self.steam64_ids),
+            "teammate_steam64_id": self.steam64_ids.astype(str),
+            "recent_matches_count": self.recent_matches_count,
+        })
+
+
+@dataclass(slots=True, frozen=True)
+class PlayerProfile:
+    steam64_id: str
+    name: str
+    id: object
+    privacy_mode: object
+    winrate: object
+    total_matches: object
+    first_match_date: object
+    bans: tuple
+    ranks: Ranks
+    competitive_ranks: tuple
+    rating: Rating
+    stats: Stats
+    matches: MatchList
+    teammates: TeammateList
+
+    @classmethod
+    def from_struct(cls, profile):
+        """Baut das Modell aus einem validierten profile_format.Profile.
+
+        Matches, Teammates und Competitive-Ränge ohne Schlüsselfelder fallen weg; fehlt der
+        Name, steht die SteamID an seiner Stelle.
+        """
+        return cls(
+            steam64_id=profile.steam64_id,
+            name=profile.name if profile.name is not None else profile.steam64_id,
+            id=profile.id,
+            privacy_mode=profile.privacy_mode,
+            winrate=profile.winrate,
+            total_matches=profile.total_matches,
+            first_match_date=profile.first_match_date,
+            bans=tuple(profile.bans),
+            ranks=Ranks(*(getattr(profile.ranks, field) for field in RANK_FIELDS)),
+            competitive_ranks=tuple((rank.map_name, rank.rank) for rank in
+                                    _complete(profile.ranks.competitive, profile_format.RANK_KEY_FIELDS)),
+            rating=Rating(*msgspec.structs.astuple(profile.rating)),
+            stats=Stats(*msgspec.structs.astuple(profile.stats)),
+            matches=MatchList.from_structs(_complete(profile.recent_matches, profile_format.MATCH_KEY_FIELDS)),
+            teammates=TeammateList.from_structs(
+                _complete(profile.recent_teammates, profile_format.TEAMMATE_KEY_FIELDS)),
+        )
+
+    def flat(self):
+        """Flache Zeile mit den Skalaren (name, rating.aim, stats.preaim, ranks.faceit_elo, ...)."""
+        row = {
+            "steam64_id": self.steam64_id, "name": self.name, "id": self.id, "privacy_mode": self.privacy_mode,
+            "winrate": self.winrate, "total_matches": self.total_matches, "first_match_date": self.first_match_date,
+        }
+        for block_name in ("ranks", "rating", "stats"):
+            block = getattr(self, block_name)
+            for field in block.__slots__:
+                row[f"{block_name}.{field}"] = getattr(block, field)
+        return row
+
+
+def read_profile(path):
+    """Liest eine Profildatei (.msgpack oder altes Pickle) in das kompakte Modell."""
+    return PlayerProfile.from_struct(profile_format.read_profile(path))
@@ -0,0 +1,182 @@
+"""Datenqualität der Profile: vollständig, teilweise oder privat.
+
+Private Profile (privacy_mode "private") bringen von Leetify nur die Skalare mit,
+aber keine recent_matches und recent_teammates; andere Profile können einzelne
+Werte als null liefern. Beides ist kein Fehler: das Schema in profile_format setzt
+fehlende Felder auf None, die Seiten zeigen dafür NaN. Diese Prüfung hält nur fest,
+welche Felder fehlen und in welche Klasse ein Profil fällt.
+
+Jeder Dateiinhalt wird genau einmal geprüft: das Ergebnis liegt unter dem SHA-1 des
+Inhalts in QUALITY_FILE. leetify_fetcher prüft direkt beim Schreiben, danach kostet
+eine unveränderte Datei nur noch das Hashen, nie ein erneutes Dekodieren.
+
+    python profile_quality.py                  # Übersicht über player_data/
+"""
+import hashlib
+import json
+import os.path
+import tempfile
+import threading
+
+import msgspec
+
+import profile_format
+from data_manifest import PLAYER_DATA_DIR, data_version, profile_files
+
+
+FULL, PARTIAL, PRIVATE = "full", "partial", "private"
+QUALITY_LABELS = {FULL: "vollständig", PARTIAL: "teilweise", PRIVATE: "privat"}
+QUALITY_FILE = "profile_quality.json"
+
+SCALAR_BLOCKS = ("rating", "stats")
+LIST_FIELDS = ("recent_matches", "recent_teammates")
+# Listen mit ihren Schlüsselfeldern; eine Zeile ohne sie fällt im Modell weg
+KEYED_LISTS = (
+    ("ranks.competitive", lambda profile: profile.ranks.competitive, profile_format.RANK_KEY_FIELDS),
+    ("recent_matches", lambda profile: profile.recent_matches, profile_format.MATCH_KEY_FIELDS),
+    ("recent_teammates", lambda profile: profile.recent_teammates, profile_format.TEAMMATE_KEY_FIELDS),
+)
+
+# Inhalts-Hash -> {"quality": ..., "missing": [...]}, wird beim ersten Zugriff aus QUALITY_FILE geladen
+_REPORTS = {"file": None, "reports": None, "dirty": False}
+# Pfad -> (mtime_ns, size, hash), damit unveränderte Dateien nicht neu gehasht werden
+_FILE_HASHES = {}
+_LOCK = threading.Lock()
+# (data_version, DataFrame) der letzten Übersicht
+_QUALITY_FRAME = None
+
+
+def check_profile(profile):
+    """Klasse und fehlende Felder eines profile_format.Profile."""
+    missing = [
+        f"{block_name}.{field}"
+        for block_name in SCALAR_BLOCKS
+        for field, value in zip(getattr(profile, block_name).__struct_fields__,
+                                msgspec.structs.astuple(getattr(profile, block_name)))
+        if value is None
+    ]
+    missing += [field for field in LIST_FIELDS if not getattr(profile, field)]
+    missing += [
+        f"{list_name}[{position}].{field}"
+        for list_name, rows, key_fields in KEYED_LISTS
+        for position, row in enumerate(rows(profile))
+        for field in key_fields
+        if getattr(row, field) is None
+    ]
+    if profile.name is None:
+        missing.append("name")
+
+    if profile.privacy_mode == "private":
+        quality = PRIVATE
+    elif missing:
+        quality = PARTIAL
+    else:
+        quality = FULL
+    return {"quality": quality, "missing": missing}
+
+
+def _reports(quality_file):
+    if _REPORTS["file"] != quality_file:
+        try:
+            with open(quality_file, encoding="utf-8") as f:
+                reports = json.load(f)
+        except (OSError, ValueError):
+            reports = {}
+        _REPORTS.update(file=quality_file, reports=reports, dirty=False)
+    return _REPORTS["reports"]
+
+
+def _decode(path, raw):
+    if path.endswith(profile_format.PROFILE_SUFFIX):
+        return profile_format.decode_profile(raw)
+    return profile_format.read_profile(path)
+
+
+def _file_hash(path):
+    stat = os.stat(path)
+    cached = _FILE_HASHES.get(path)
+    if cached is not None and cached[:2] == (stat.st_mtime_ns, stat.st_size):
+        return cached[2], None
+    with open(path, "rb") as f:
+        raw = f.read()
+    content_hash = hashlib.sha1(raw).hexdigest()
+    _FILE_HASHES[path] = (stat.st_mtime_ns, stat.st_size, content_hash)
+    return content_hash, raw
+
+
+def check_file(path, quality_file=QUALITY_FILE):
+    """Prüfbericht einer Profildatei, pro Dateiinhalt nur einmal berechnet. Fehler beim Lesen werden geworfen."""
+    with _LOCK:
+        content_hash, raw = _file_hash(path)
+        reports = _reports(quality_file)
+        report = reports.get(content_hash)
+        if report is not None:
+            return report
+
+    if raw is None:
+        with open(path, "rb") as f:
+            raw = f.read()
+    report = check_profile(_decode(path, raw))
+    with _LOCK:
+        _reports(quality_file)[content_hash] = report
+        _REPORTS["dirty"] = True
+    return report
+
+
+def save(quality_file=QUALITY_FILE):
+    """Schreibt neu berechnete Berichte nach QUALITY_FILE."""
+    with _LOCK:
+        if not _REPORTS["dirty"] or _REPORTS["file"] != quality_file:
+            return
+        # eindeutige Temp-Datei: App und Fetcher speichern aus getrennten Prozessen in dieselbe Datei
+        fd, tmp_path = tempfile.mkstemp(prefix=f".{os.path.basename(quality_file)}.",
+                                        dir=os.path.dirname(quality_file) or ".")
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump(_REPORTS["reports"], f)
+            os.replace(tmp_path, quality_file)
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
+        _REPORTS["dirty"] = False
+
+
+def quality_frame(data_dir=PLAYER_DATA_DIR, quality_file=QUALITY_FILE):
+    """Eine Zeile pro Profildatei: SteamID, Datei, Qualität und fehlende Felder (Index SteamID)."""
+    global _QUALITY_FRAME
+    import pandas as pd
+
+    version = data_version(data_dir)
+    if _QUALITY_FRAME is not None and _QUALITY_FRAME[0] == (data_dir, version):
+        return _QUALITY_FRAME[1]
+
+    rows = []
+    for file_name in sorted(profile_files(data_dir)):
+        try:
+            report = check_file(os.path.join(data_dir, file_name), quality_file)
+        except Exception:
+            # defekte Dateien meldet data_handling.get_load_errors
+            continue
+        rows.append({
+            "SteamID": file_name.split("-", 1)[0],
+            "Datei": file_name,
+            "Qualität": report["quality"],
+            "Fehlend": len(report["missing"]),
+            "Fehlende Felder": ", ".join(report["missing"]),
+        })
+    save(quality_file)
+
+    frame = pd.DataFrame(rows, columns=["SteamID", "Datei", "Qualität", "Fehlend", "Fehlende Felder"])
+    frame = frame.set_index("SteamID", drop=False).rename_axis(None)
+    _QUALITY_FRAME = ((data_dir, version), frame)
+    return frame
+
+
+if __name__ == "__main__":
+    df = quality_frame()
+    for quality, label in QUALITY_LABELS.items():
+        files = df.loc[df["Qualität"] == quality, "Datei"].tolist()
+        print(f"{label}: {len(files)}")
+        if quality != FULL:
+            for file_name in files:
+                print(f"   {file_name}")
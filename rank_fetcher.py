@@ -0,0 +1,297 @@
+"""Aktualisiert nur die Ränge aus reinen Rang-Quellen (FACEIT Level und Elo) per asyncio.
+
+Aufruf:
+    python rank_fetcher.py                       # alle Spieler aus player_data/, nur abgelaufene Quellen
+    python rank_fetcher.py --force 76561197961498793
+    python rank_fetcher.py --stub                # gegen einen lokalen Stub statt der echten APIs
+
+Pro Quelle gibt es eine TTL (SOURCES); nur abgelaufene Einträge werden neu geholt.
+Alle Abfragen laufen über eine aiohttp-Session mit genau einer Keep-Alive-Verbindung
+pro Host; mehrere Quellen laufen parallel, die Spieler einer Quelle nacheinander
+über dieselbe Verbindung. Die Ergebnisse landen in RANK_CACHE_FILE; rank_frame legt
+sie über die Ränge aus dem Roster-Store, sofern sie neuer als die Profildatei sind.
+
+Leetify hat keinen Rang-Endpunkt, nur das ganze Profil samt Match-Historie. Premier,
+Wingman, Renown und Competitive pro Map kommen deshalb nur mit leetify_fetcher; dessen
+bedingte Abfragen (ETag aus fetch_state.json) kosten bei unverändertem Profil nichts.
+"""
+import argparse
+import asyncio
+import hashlib
+import json
+import os
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+import aiohttp
+
+from data_manifest import PLAYER_DATA_DIR, directory_manifest
+from http_retry import RETRY_STATUS, retry_delay
+
+
+RANK_CACHE_FILE = "rank_cache.json"
+CONNECTIONS_PER_HOST = 1
+
+SOURCES = {
+    "faceit": {
+        "url": "https://open.faceit.com/data/v4/players",
+        "params": lambda steam_id: {"game": "cs2", "game_player_id": steam_id},
+        "api_key_env": "FACEIT_API_KEY",
+        "ttl": 15 * 60,
+        "rate": 10.0,
+    },
+}
+# Felder, die eine Quelle liefert
+SOURCE_FIELDS = {
+    "faceit": ("faceit", "faceit_elo"),
+}
+
+
+def extract_ranks(source, data):
+    """Rang-Felder aus der Antwort einer Quelle."""
+    cs2 = (data.get("games") or {}).get("cs2") or {}
+    return {"faceit": cs2.get("skill_level"), "faceit_elo": cs2.get("faceit_elo")}
+
+
+def load_rank_cache(cache_file=RANK_CACHE_FILE):
+    """steam64_id -> quelle -> {"fetched_at", "ranks", "etag"}."""
+    try:
+        with open(cache_file, encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def rank_cache_version(cache_file=RANK_CACHE_FILE):
+    """Ändert sich mit jedem Schreiben des Rang-Caches (0, solange es ihn nicht gibt)."""
+    try:
+        return os.stat(cache_file).st_mtime_ns
+    except OSError:
+        return 0
+
+
+def save_rank_cache(cache, cache_file=RANK_CACHE_FILE):
+    tmp_path = os.path.join(os.path.dirname(cache_file), f".{os.path.basename(cache_file)}")
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(cache, f)
+    os.replace(tmp_path, cache_file)
+
+
+def due_sources(entry, now, sources=SOURCES):
+    """Quellen, deren Eintrag fehlt oder älter als ihre TTL ist."""
+    return [
+        source for source, config in sources.items()
+        if now - (entry.get(source) or {}).get("fetched_at", 0) >= config["ttl"]
+    ]
+
+
+class _Pacer:
+    """Hält pro Quelle einen Mindestabstand zwischen zwei Anfragen (rate pro Sekunde)."""
+
+    def __init__(self, rate):
+        self.interval = 1.0 / rate
+        self.next_at = 0.0
+        self.lock = asyncio.Lock()
+
+    async def wait(self):
+        async with self.lock:
+            delay = self.next_at - time.monotonic()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            self.next_at = max(self.next_at, time.monotonic()) + self.interval
+
+
+async def fetch_source(session, pacer, source, config, steam_id, etag=None, max_retries=4):
+    """Holt die Ränge eines Spielers von einer Quelle. Liefert (ranks oder None bei 304, etag).
+
+    Bei 404 (kein Konto bei der Quelle) sind die ranks leer, es bleibt dann beim Wert aus dem Profil.
+    """
+    headers = {}
+    api_key = os.environ.get(config["api_key_env"])
+    if api_key:
+        headers["Authorization"] = f"Bearer {api_key}"
+    if etag:
+        headers["If-None-Match"] = etag
+
+    for attempt in range(max_retries + 1):
+        await pacer.wait()
+        try:
+            async with session.get(config["url"], params=config["params"](steam_id), headers=headers) as response:
+                if response.status in RETRY_STATUS and attempt < max_retries:
+                    delay = retry_delay(attempt, response)
+                elif response.status == 304:
+                    return None, etag
+                elif response.status == 404:
+                    return {}, None
+                else:
+                    response.raise_for_status()
+                    return extract_ranks(source, await response.json()), response.headers.get("ETag")
+        except aiohttp.ClientConnectionError:
+            if attempt == max_retries:
+                raise
+            delay = retry_delay(attempt)
+        await asyncio.sleep(delay)
+
+
+async def _fetch_all(jobs, sources, cache, result, timeout):
+    connector = aiohttp.TCPConnector(limit=0, limit_per_host=CONNECTIONS_PER_HOST)
+    pacers = {source: _Pacer(config["rate"]) for source, config in sources.items()}
+
+    # kein Gesamt-Timeout: bei einer Verbindung pro Host warten Anfragen sonst schon in der Warteschlange ab
+    timeout = aiohttp.ClientTimeout(total=None, sock_connect=timeout, sock_read=timeout)
+    async with aiohttp.ClientSession(connector=connector, timeout=timeout) as session:
+        async def fetch_one(steam_id, source):
+            entry = cache.setdefault(steam_id, {})
+            previous = entry.get(source) or {}
+            try:
+                ranks, etag = await fetch_source(session, pacers[source], source, sources[source], steam_id,
+                                                 previous.get("etag"))
+            except Exception as e:
+                print(f"❌ Fehler bei {source} für {steam_id}: {type(e).__name__}: {e}")
+                result["failed"][f"{steam_id}/{source}"] = str(e)
+                return
+            # bei 304 bleiben die alten Ränge, nur der Zeitpunkt wird erneuert
+            entry[source] = {"fetched_at": time.time(), "ranks": previous.get("ranks") if ranks is None else ranks,
+                             "etag": etag}
+            result["unchanged" if ranks is None else "updated"].append(f"{steam_id}/{source}")
+
+        async def lane(source, steam_ids):
+            for steam_id in steam_ids:
+                await fetch_one(steam_id, source)
+
+        # pro Quelle so viele Spuren wie Verbindungen; sonst stauen sich Hunderte Wartende am Pool
+        lanes = []
+        for source in sources:
+            steam_ids = [steam_id for steam_id, job_source in jobs if job_source == source]
+            lanes += [lane(source, steam_ids[index::CONNECTIONS_PER_HOST]) for index in range(CONNECTIONS_PER_HOST)]
+        await asyncio.gather(*lanes)
+
+
+def fetch_ranks(steam_ids, sources=SOURCES, cache_file=RANK_CACHE_FILE, force=False, timeout=15):
+    """Aktualisiert alle abgelaufenen (bzw. mit force alle) Quellen. Liefert updated/unchanged/skipped/failed."""
+    cache = load_rank_cache(cache_file)
+    now = time.time()
+    result = {"updated": [], "unchanged": [], "skipped": [], "failed": {}}
+
+    jobs = []
+    for steam_id in steam_ids:
+        due = list(sources) if force else due_sources(cache.get(steam_id) or {}, now, sources)
+        jobs += [(steam_id, source) for source in due]
+        result["skipped"] += [f"{steam_id}/{source}" for source in sources if source not in due]
+
+    if jobs:
+        asyncio.run(_fetch_all(jobs, sources, cache, result, timeout))
+        save_rank_cache(cache, cache_file)
+    return result
+
+
+def rank_frame(data_dir=PLAYER_DATA_DIR, cache_file=RANK_CACHE_FILE):
+    """Ränge aller Spieler aus dem Roster, überlagert mit neueren Werten aus dem Rang-Cache.
+
+    Liefert (ranks, competitive): ranks mit steam64_id, name, den Rang-Feldern und pro
+    Feld der Quelle ("profil" oder "faceit"); competitive in Long-Form, aus dem Roster-Store.
+    Einträge älterer Caches von Quellen, die es nicht mehr gibt, werden ignoriert.
+    """
+    import pandas as pd
+
+    from data_handling import load_profile_table, load_store_table
+    from profile_model import RANK_FIELDS
+
+    ranks = load_profile_table(["steam64_id", "name", *[f"ranks.{field}" for field in RANK_FIELDS]], data_dir)
+    ranks = ranks.rename(columns={f"ranks.{field}": field for field in RANK_FIELDS}).set_index("steam64_id")
+    competitive = load_store_table("competitive_ranks", data_dir=data_dir)
+    for field in RANK_FIELDS:
+        ranks[f"{field}_source"] = "profil"
+
+    # Stand des Profils = Änderungszeit seiner Datei
+    profile_times = {
+        file_name.split("-", 1)[0]: mtime_ns / 1e9 for file_name, (mtime_ns, _) in directory_manifest(data_dir).items()
+    }
+    cache = load_rank_cache(cache_file)
+    for steam_id, entry in cache.items():
+        if steam_id not in ranks.index:
+            continue
+        for source, fields in SOURCE_FIELDS.items():
+            cached = entry.get(source) or {}
+            if not cached.get("ranks") or cached["fetched_at"] <= profile_times.get(steam_id, 0):
+                continue
+            for field in fields:
+                ranks.loc[steam_id, field] = cached["ranks"].get(field)
+                ranks.loc[steam_id, f"{field}_source"] = source
+
+    ranks[list(RANK_FIELDS)] = ranks[list(RANK_FIELDS)].apply(pd.to_numeric)
+    return ranks.reset_index(), competitive
+
+
+class _StubHandler(BaseHTTPRequestHandler):
+    """Antwortet wie die FACEIT Data API mit zufälligen, pro SteamID festen Rängen."""
+
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+    latency = 0.0
+
+    def do_GET(self):
+        time.sleep(self.latency)
+        steam_id = parse_qs(urlsplit(self.path).query)["game_player_id"][0]
+        rng = random.Random(steam_id)
+        body = {"games": {"cs2": {"skill_level": rng.randint(1, 10), "faceit_elo": rng.randint(500, 3000)}}}
+        raw = json.dumps(body).encode("utf-8")
+        etag = f'"{hashlib.sha1(raw).hexdigest()[:16]}"'
+        if self.headers.get("If-None-Match") == etag:
+            self.send_response(304)
+            self.send_header("ETag", etag)
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(raw)))
+        self.send_header("ETag", etag)
+        self.end_headers()
+        self.wfile.write(raw)
+
+    def log_request(self, code="-", size="-"):
+        pass
+
+
+def start_stub(latency=0.0):
+    """Startet pro Quelle einen Stub-Server im Hintergrund (ein Host je Quelle). Liefert (server, SOURCES dazu)."""
+    handler = type("StubHandler", (_StubHandler,), {"latency": latency})
+    servers, sources = [], {}
+    for source, config in SOURCES.items():
+        server = ThreadingHTTPServer(("127.0.0.1", 0), handler)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        url = f"http://127.0.0.1:{server.server_port}{urlsplit(config['url']).path}"
+        sources[source] = {**config, "url": url, "rate": 1000.0}
+        servers.append(server)
+    return servers, sources
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Nur die Ränge der Spieler aktualisieren")
+    parser.add_argument("steam_ids", nargs="*", help="SteamID64s (Standard: alle aus player_data/)")
+    parser.add_argument("--force", action="store_true", help="TTLs ignorieren")
+    parser.add_argument("--data-dir", default=PLAYER_DATA_DIR)
+    parser.add_argument("--cache-file", default=RANK_CACHE_FILE)
+    parser.add_argument("--stub", action="store_true", help="lokalen Stub statt der echten APIs verwenden")
+    args = parser.parse_args()
+
+    steam_ids = args.steam_ids or sorted({name.split("-", 1)[0] for name in directory_manifest(args.data_dir)})
+    sources = SOURCES
+    if args.stub:
+        servers, sources = start_stub()
+        print(f"ℹ️ Stub läuft auf Port {', '.join(str(server.server_port) for server in servers)}")
+
+    start = time.perf_counter()
+    result = fetch_ranks(steam_ids, sources, args.cache_file, args.force)
+    print(f"Fertig in {time.perf_counter() - start:.2f}s: {len(result['updated'])} aktualisiert, "
+          f"{len(result['unchanged'])} unverändert, {len(result['skipped'])} noch frisch, "
+          f"{len(result['failed'])} fehlgeschlagen")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,102 @@
+"""Perzentile, z-Scores und richtungsbereinigte Normierung für alle Registry-Metriken.
+
+Alles steckt in einem NumPy-Array `values` der Form (len(KINDS), Spieler, Metriken),
+das nur neu berechnet wird, wenn sich der Datenstand ändert. Bei Metriken mit
+higher_is_better=False wird die Richtung umgedreht, 100 bzw. ein positiver
+z-Score bedeuten also immer "besser".
+"""
+import warnings
+
+import numpy as np
+import pandas as pd
+
+from data_handling import data_version, get_stats_frame
+from metrics import all_metrics, page_columns
+from perf import cache_event, span
+
+
+KINDS = ("percentile", "zscore", "normalized")
+
+# (data_version, ranking)
+_RANKING = None
+
+
+def build_ranking(df):
+    metrics = all_metrics()
+    columns = [metric["column"] for metric in metrics]
+    direction = np.array([1.0 if metric.get("higher_is_better", True) else -1.0 for metric in metrics])
+
+    # Richtung einrechnen, danach ist bei allen Spalten "größer = besser"
+    raw = df[columns].to_numpy(dtype=np.float64)
+    oriented = raw * direction
+
+    # Perzentil 0..100, Gleichstände bekommen den Mittelwert, NaN bleibt NaN
+    percentile = pd.DataFrame(oriented).rank(pct=True).to_numpy() * 100
+
+    # leere oder komplett fehlende Spalten ergeben NaN statt Warnungen
+    with warnings.catch_warnings(), np.errstate(invalid="ignore", divide="ignore"):
+        warnings.simplefilter("ignore", RuntimeWarning)
+        mean = np.nanmean(oriented, axis=0)
+        std = np.nanstd(oriented, axis=0)
+        zscore = (oriented - mean) / np.where(std > 0, std, np.nan)
+
+        low = np.nanmin(oriented, axis=0)
+        high = np.nanmax(oriented, axis=0)
+        normalized = (oriented - low) / np.where(high > low, high - low, np.nan) * 100
+
+    return {
+        "names": df["Name"].to_numpy(),
+        "steam_ids": df["SteamID"].to_numpy(),
+        "columns": columns,
+        "raw": raw,
+        "values": np.stack([percentile, zscore, normalized]),
+    }
+
+
+def get_ranking():
+    """Ranking zum aktuellen Datenstand, wird nur bei geänderten Daten neu berechnet."""
+    global _RANKING
+
+    version = data_version()
+    hit = _RANKING is not None and _RANKING[0] == version
+    cache_event("ranking", hit)
+    if not hit:
+        frame = get_stats_frame()
+        with span("transform.ranking"):
+            _RANKING = (version, build_ranking(frame))
+    return _RANKING[1]
+
+
+def ranking_frame(kind="percentile", columns=None, ranking=None):
+    """Name, SteamID und die gewählte Normierung als DataFrame."""
+    ranking = ranking or get_ranking()
+    columns = columns or ranking["columns"]
+    indices = [ranking["columns"].index(column) for column in columns]
+
+    df = pd.DataFrame(ranking["values"][KINDS.index(kind)][:, indices], columns=columns)
+    df.insert(0, "Name", ranking["names"])
+    df.insert(1, "SteamID", ranking["steam_ids"])
+    return df
+
+
+def page_ranking(page_key, kind="percentile"):
+    return ranking_frame(kind, page_columns(page_key))
+
+
+def leaderboard(column, top=None, ranking=None):
+    """Rangliste einer Metrik, bester Spieler zuerst (NaN ans Ende)."""
+    ranking = ranking or get_ranking()
+    index = ranking["columns"].index(column)
+    percentile = ranking["values"][KINDS.index("percentile")][:, index]
+
+    order = np.argsort(-np.nan_to_num(percentile, nan=-np.inf), kind="stable")
+    if top is not None:
+        order = order[:top]
+
+    return pd.DataFrame({
+        "Platz": np.arange(1, len(order) + 1),
+        "Name": ranking["names"][order],
+        column: ranking["raw"][order, index],
+        "Perzentil": percentile[order],
+        "z-Score": ranking["values"][KINDS.index("zscore")][order, index],
+    })
@@ -0,0 +1,67 @@
+import streamlit as st
+import plotly.express as px
+
+from data_handling import data_version
+from perf import cache_call, cache_miss, span
+from rank_fetcher import rank_cache_version, rank_frame
+
+
+RANK_COLUMNS = {
+    "premier": "Premier",
+    "faceit": "FACEIT Level",
+    "faceit_elo": "FACEIT Elo",
+    "wingman": "Wingman",
+    "renown": "Renown",
+    "leetify": "Leetify",
+}
+
+
+@st.cache_resource(max_entries=2)
+def load_rank_data(version, cache_version):
+    """Ränge aus dem Roster plus neuere Werte aus dem Rang-Cache, einmal pro Datenstand."""
+    cache_miss("st.load_rank_data")
+    ranks, competitive = rank_frame()
+    names = ranks.set_index("steam64_id")["name"]
+    competitive = competitive[competitive["rank"] > 0].assign(Name=competitive["steam64_id"].map(names))
+    matrix = competitive.pivot_table(index="Name", columns="map_name", values="rank")
+    return ranks, matrix
+
+
+st.title("🏅Leetify Ranks")
+st.markdown("---")
+
+with span("load", "ranks"):
+    cache_call("st.load_rank_data")
+    df_ranks, df_competitive = load_rank_data(data_version(), rank_cache_version())
+
+st.caption("FACEIT-Ränge aktualisieren ohne Match-Historie: `python rank_fetcher.py`; Premier, Wingman, "
+           "Renown und Competitive kommen mit `python leetify_fetcher.py` "
+           "(Spalte Quelle: profil = aus der Profildatei, sonst der neuere Wert aus dem Rang-Abruf)")
+
+df_table = df_ranks.rename(columns={"name": "Name", **RANK_COLUMNS})
+df_table["Quelle"] = [
+    ", ".join(sorted({row[f"{field}_source"] for field in RANK_COLUMNS})) for _, row in df_ranks.iterrows()
+]
+st.dataframe(
+    df_table[["Name", *RANK_COLUMNS.values(), "Quelle"]].sort_values("Premier", ascending=False),
+    hide_index=True,
+)
+
+column = st.radio("Rang:", [RANK_COLUMNS[field] for field in ("premier", "faceit_elo", "wingman", "leetify")],
+                  horizontal=True)
+df_bar = df_table.dropna(subset=[column]).sort_values(column, ascending=False)
+fig = px.bar(df_bar, x="Name", y=column, color=column, color_continuous_scale=px.colors.sequential.Turbo,
+             title=f"{column} im Roster")
+fig.update_layout(xaxis_title="Spieler", yaxis_title=column)
+with span("render.serialize", "ranks"):
+    st.plotly_chart(fig, use_container_width=True)
+
+st.header("Competitive-Rang pro Map")
+if df_competitive.empty:
+    st.info("Keine Competitive-Ränge vorhanden.")
+else:
+    fig = px.imshow(df_competitive, color_continuous_scale=px.colors.sequential.Turbo, text_auto=True,
+                    title="Competitive-Rang (1–18) pro Spieler und Map")
+    fig.update_layout(xaxis_title="", yaxis_title="")
+    with span("render.serialize", "ranks"):
+        st.plotly_chart(fig, use_container_width=True)
@@ -0,0 +1,85 @@
+import json
+import os
+import tempfile
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.feather as feather
+
+
+STORE_DIR = "roster_store"
+MANIFEST_FILE = "manifest.json"
+
+TABLES = ("profiles", "competitive_ranks", "matches", "teammates")
+
+
+def profile_tables(profiles):
+    """Zerlegt die Profile (profile_model.PlayerProfile) in die Tabellen des Stores."""
+    rank_rows = [
+        {"steam64_id": player.steam64_id, "map_name": map_name, "rank": rank}
+        for player in profiles
+        for map_name, rank in player.competitive_ranks
+    ]
+    match_frames = [player.matches.frame(player.steam64_id) for player in profiles if len(player.matches)]
+    teammate_frames = [player.teammates.frame(player.steam64_id) for player in profiles]
+
+    return {
+        "profiles": pd.DataFrame([player.flat() for player in profiles]),
+        "competitive_ranks": pd.DataFrame(rank_rows, columns=["steam64_id", "map_name", "rank"]),
+        "matches": pd.concat(match_frames, ignore_index=True) if match_frames else pd.DataFrame(),
+        "teammates": pd.concat(teammate_frames, ignore_index=True) if teammate_frames else pd.DataFrame(
+            columns=["steam64_id", "teammate_steam64_id", "recent_matches_count"]
+        ),
+    }
+
+
+def _replace_file(store_dir, file_name, write):
+    """Schreibt über eine eindeutige Temp-Datei und ersetzt file_name atomar."""
+    fd, tmp_path = tempfile.mkstemp(dir=store_dir, prefix=f".{file_name}.")
+    os.close(fd)
+    try:
+        write(tmp_path)
+        os.replace(tmp_path, os.path.join(store_dir, file_name))
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+
+
+def _write_json(path, data):
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(data, f)
+
+
+def write_store(profiles, manifest, store_dir=STORE_DIR):
+    """Schreibt alle Tabellen als Arrow-IPC-Dateien plus Manifest der Quelldateien."""
+    os.makedirs(store_dir, exist_ok=True)
+
+    for name, df in profile_tables(profiles).items():
+        table = pa.Table.from_pandas(df, preserve_index=False)
+        # unkomprimiert, damit die Dateien per memory map gelesen werden können
+        _replace_file(store_dir, f"{name}.arrow",
+                      lambda path: feather.write_feather(table, path, compression="uncompressed"))
+
+    _replace_file(store_dir, MANIFEST_FILE, lambda path: _write_json(path, manifest))
+
+
+def read_manifest(store_dir=STORE_DIR):
+    try:
+        with open(os.path.join(store_dir, MANIFEST_FILE), encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def read_table(name, columns=None, store_dir=STORE_DIR):
+    """Liest eine Tabelle (optional nur einzelne Spalten) per memory map."""
+    path = os.path.join(store_dir, f"{name}.arrow")
+    table = feather.read_table(path, columns=columns, memory_map=True)
+    return table.to_pandas()
+
+
+if __name__ == "__main__":
+    from data_handling import build_roster_store
+
+    build_roster_store()
+    print(f"✅ Roster-Store geschrieben: {STORE_DIR}")
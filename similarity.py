@@ -0,0 +1,170 @@
+"""Ähnlichkeitssuche über die Stat-Vektoren aller Spieler.
+
+Pro Datenstand wird einmal eine float32-Matrix (Spieler × Registry-Metriken) aus den
+richtungsbereinigten z-Scores von ranking.py gebaut; fehlende Werte zählen als
+Roster-Durchschnitt (0). Abfragen sind reine Matrix-Vektor-Produkte:
+
+    nearest(steam_id, k=5, metric="cosine", pages=["aim"])   "wer spielt wie ich"
+    fill_gap(team_ids, pages=["flash", "he"])                 "wer schließt unsere Lücke"
+
+Ab INDEX_MIN_PLAYERS Spielern wird zusätzlich ein grober k-Means-Index gebaut
+(IVF): eine Abfrage vergleicht dann nur noch die Spieler der INDEX_PROBES nächsten
+Cluster statt aller Spieler.
+"""
+import numpy as np
+import pandas as pd
+
+from data_handling import data_version
+from metrics import page_columns
+from perf import cache_event, span
+from ranking import KINDS, get_ranking
+
+
+METRICS = ("cosine", "euclidean")
+INDEX_MIN_PLAYERS = 50000
+INDEX_PROBES = 8
+KMEANS_ITERATIONS = 10
+
+# (data_version, model)
+_MODEL = None
+
+
+def build_model(ranking, with_index=None):
+    zscore = ranking["values"][KINDS.index("zscore")]
+    matrix = np.nan_to_num(zscore, nan=0.0).astype(np.float32)
+
+    model = {
+        "names": ranking["names"],
+        "steam_ids": ranking["steam_ids"],
+        "columns": ranking["columns"],
+        "matrix": matrix,
+        "index": None,
+    }
+    if with_index is None:
+        with_index = len(matrix) >= INDEX_MIN_PLAYERS
+    if with_index:
+        model["index"] = build_index(matrix)
+    return model
+
+
+def build_index(matrix, clusters=None, seed=0):
+    """Grober k-Means-Index: Zentren plus Spieler-Positionen pro Cluster."""
+    clusters = clusters or max(1, int(np.sqrt(len(matrix))))
+    rng = np.random.default_rng(seed)
+    centers = matrix[rng.choice(len(matrix), clusters, replace=False)]
+
+    for _ in range(KMEANS_ITERATIONS):
+        assignment = _closest(matrix, centers)
+        sums = np.zeros_like(centers)
+        np.add.at(sums, assignment, matrix)
+        counts = np.bincount(assignment, minlength=clusters)[:, None]
+        # leere Cluster behalten ihr altes Zentrum
+        centers = np.where(counts > 0, sums / np.maximum(counts, 1), centers).astype(np.float32)
+
+    assignment = _closest(matrix, centers)
+    order = np.argsort(assignment, kind="stable")
+    return {
+        "centers": centers,
+        "members": order,
+        "offsets": np.searchsorted(assignment[order], np.arange(clusters + 1)),
+    }
+
+
+def _closest(matrix, centers):
+    distances = (centers * centers).sum(axis=1) - 2 * matrix @ centers.T
+    return distances.argmin(axis=1)
+
+
+def get_model():
+    """Modell zum aktuellen Datenstand, wird nur bei geänderten Daten neu gebaut."""
+    global _MODEL
+
+    version = data_version()
+    hit = _MODEL is not None and _MODEL[0] == version
+    cache_event("similarity", hit)
+    if not hit:
+        ranking = get_ranking()
+        with span("transform.similarity"):
+            _MODEL = (version, build_model(ranking))
+    return _MODEL[1]
+
+
+def _column_indices(model, pages):
+    if not pages:
+        return np.arange(len(model["columns"]))
+    columns = {column for page_key in pages for column in page_columns(page_key)}
+    return np.array([index for index, column in enumerate(model["columns"]) if column in columns])
+
+
+def _candidates(model, query, use_index):
+    index = model["index"]
+    if index is None or not use_index:
+        return None
+    nearest_clusters = np.argsort(((index["centers"] - query) ** 2).sum(axis=1))[:INDEX_PROBES]
+    return np.concatenate([
+        index["members"][index["offsets"][cluster]:index["offsets"][cluster + 1]] for cluster in nearest_clusters
+    ])
+
+
+def _scores(vectors, query, metric):
+    """Größer = ähnlicher: Kosinus-Ähnlichkeit bzw. negative euklidische Distanz."""
+    if metric == "cosine":
+        norms = np.linalg.norm(vectors, axis=1) * np.linalg.norm(query)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            return np.where(norms > 0, vectors @ query / norms, 0.0)
+    return -np.sqrt(np.maximum(((vectors - query) ** 2).sum(axis=1), 0))
+
+
+def _top_k(scores, k):
+    """Positionen der k größten endlichen Scores, absteigend."""
+    k = min(k, len(scores))
+    top = np.argpartition(-scores, k - 1)[:k] if k else np.array([], dtype=int)
+    top = top[np.argsort(-scores[top], kind="stable")]
+    return top[np.isfinite(scores[top])]
+
+
+def _result_frame(model, positions, scores, score_name):
+    return pd.DataFrame({
+        "Name": model["names"][positions],
+        "SteamID": model["steam_ids"][positions],
+        score_name: scores,
+    })
+
+
+def nearest(steam_id, k=5, metric="cosine", pages=None, model=None, use_index=True):
+    """Die k ähnlichsten Spieler zu steam_id, optional nur über die Metriken einzelner Seiten."""
+    model = model or get_model()
+    matches = np.flatnonzero(model["steam_ids"] == steam_id)
+    if not len(matches):
+        raise KeyError(steam_id)
+    player = matches[0]
+
+    candidates = _candidates(model, model["matrix"][player], use_index and not pages)
+    columns = _column_indices(model, pages)
+    vectors = model["matrix"][:, columns] if candidates is None else model["matrix"][candidates][:, columns]
+    positions = np.arange(len(model["matrix"])) if candidates is None else candidates
+
+    scores = _scores(vectors, model["matrix"][player, columns], metric)
+    scores[positions == player] = -np.inf
+    top = _top_k(scores, k)
+
+    score_name = "Ähnlichkeit" if metric == "cosine" else "Distanz"
+    values = scores[top] if metric == "cosine" else -scores[top]
+    return _result_frame(model, positions[top], values, score_name)
+
+
+def fill_gap(team_ids, k=5, pages=("flash", "he"), model=None):
+    """Spieler, die genau dort stark sind, wo das Team im Schnitt unter dem Roster liegt."""
+    model = model or get_model()
+    columns = _column_indices(model, pages)
+    team = np.isin(model["steam_ids"], list(team_ids))
+
+    vectors = model["matrix"][:, columns]
+    # Lücke in z-Score-Einheiten: nur Metriken, bei denen das Team unter dem Schnitt liegt
+    gap = np.clip(-vectors[team].mean(axis=0), 0, None) if team.any() else np.ones(len(columns), np.float32)
+
+    scores = vectors @ gap
+    scores[team] = -np.inf
+    top = _top_k(scores, k)
+    result = _result_frame(model, top, scores[top], "Lücken-Score")
+    return result, pd.Series(gap, index=[model["columns"][index] for index in columns], name="Lücke")
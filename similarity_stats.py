@@ -0,0 +1,72 @@
+import streamlit as st
+import plotly.express as px
+
+from metrics import PAGES, page_columns
+from perf import span
+from ranking import ranking_frame
+from similarity import fill_gap, get_model, nearest
+
+
+METRIC_LABELS = {"cosine": "Kosinus (Spielstil)", "euclidean": "Euklidisch (Spielstil und Niveau)"}
+
+st.title("🧬Leetify Ähnlichkeit")
+st.markdown("---")
+
+with span("load", "similarity"):
+    model = get_model()
+
+if not len(model["steam_ids"]):
+    st.warning("Keine Spieler geladen.")
+    st.stop()
+
+name_to_id = dict(zip(model["names"], model["steam_ids"]))
+page_options = list(PAGES)
+
+st.header("Wer spielt wie ich?")
+player = st.selectbox("Spieler:", options=sorted(name_to_id))
+col_metric, col_k = st.columns(2)
+metric = col_metric.radio("Maß:", list(METRIC_LABELS), format_func=METRIC_LABELS.get, horizontal=True)
+k = col_k.slider("Anzahl Spieler:", 1, 20, 5)
+pages = st.multiselect(
+    "Nur Metriken dieser Seiten (leer = alle):", options=page_options, format_func=lambda key: PAGES[key]["title"]
+)
+
+with span("transform.similarity_query", "similarity"):
+    df_similar = nearest(name_to_id[player], k, metric, pages)
+st.dataframe(df_similar.drop(columns="SteamID"), hide_index=True)
+
+columns = [column for page_key in (pages or page_options) for column in page_columns(page_key)]
+compared = [name_to_id[player], *df_similar["SteamID"].head(3)]
+df_percentile = ranking_frame("percentile", list(dict.fromkeys(columns)))
+df_long = df_percentile[df_percentile["SteamID"].isin(compared)].drop(columns="SteamID").melt(
+    id_vars=["Name"], var_name="Metric", value_name="Perzentil"
+)
+fig = px.line_polar(df_long, r="Perzentil", theta="Metric", color="Name", line_close=True, render_mode="svg",
+                    title=f"{player} und die ähnlichsten Spieler (Perzentil im Roster)")
+fig.update_traces(fill="toself", opacity=0.5)
+fig.update_layout(polar=dict(radialaxis=dict(visible=True, range=[0, 100])), legend_title_text="Spieler")
+with span("render.serialize", "similarity"):
+    st.plotly_chart(fig, use_container_width=True)
+
+st.markdown("---")
+st.header("Wer schließt unsere Lücke?")
+team = st.multiselect("Unser Team:", options=sorted(name_to_id))
+gap_pages = st.multiselect(
+    "Bereich:", options=page_options, default=["flash", "he"], format_func=lambda key: PAGES[key]["title"]
+)
+
+if not gap_pages:
+    st.info("Bitte mindestens einen Bereich auswählen.")
+    st.stop()
+
+with span("transform.similarity_gap", "similarity"):
+    df_gap, gap = fill_gap([name_to_id[name] for name in team], k, gap_pages)
+
+if team:
+    gap = gap[gap > 0]
+    if gap.empty:
+        st.success("Das Team liegt in diesem Bereich überall über dem Roster-Schnitt.")
+    else:
+        st.markdown("Lücke des Teams in z-Scores unter dem Roster-Schnitt:")
+        st.bar_chart(gap)
+st.dataframe(df_gap.drop(columns="SteamID"), hide_index=True)
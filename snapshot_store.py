@@ -0,0 +1,160 @@
+"""Append-only Verlauf der Profil-Skalare (rating.*, stats.*, ranks.*) über alle Ingestions.
+
+Aufbau von snapshots/:
+    index.json                      ein Eintrag pro Snapshot, nach Zeit sortiert
+    2026-10/20261018T151800Z.arrow  Arrow IPC, zstd-komprimiert
+
+Pro Monat ist der erste Snapshot vollständig, alle weiteren enthalten nur die Spieler,
+deren Werte sich gegenüber dem Stand davor geändert haben. Der Stand zu einem
+Zeitpunkt ergibt sich aus dem vollständigen Snapshot seines Monats plus den Deltas bis
+dahin; ältere Monate müssen nie gelesen werden. Spieler, die aus player_data/
+verschwinden, behalten ihren letzten Stand.
+
+Einen Snapshot aufnehmen (leetify_fetcher macht das nach jedem Abruf selbst):
+    python snapshot_store.py
+"""
+import bisect
+import json
+import os.path
+from datetime import datetime, timezone
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.feather as feather
+
+import roster_store
+from data_handling import PLAYER_DATA_DIR, data_version, load_profile_table, metric_frame
+
+
+SNAPSHOT_DIR = "snapshots"
+INDEX_FILE = "index.json"
+SCALAR_PREFIXES = ("rating.", "stats.", "ranks.")
+
+# Spalten der Verlauf-Seite: Metrik aus der Registry bzw. Rohwert aus ranks
+HISTORY_COLUMNS = {"Aim_Rating": None, "Leetify_Rating": None, "faceit_elo": "ranks.faceit_elo"}
+
+
+def read_index(snapshot_dir=SNAPSHOT_DIR):
+    try:
+        with open(os.path.join(snapshot_dir, INDEX_FILE), encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return []
+
+
+def _write_index(index, snapshot_dir):
+    tmp_path = os.path.join(snapshot_dir, f".{INDEX_FILE}")
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(index, f, indent=1)
+    os.replace(tmp_path, os.path.join(snapshot_dir, INDEX_FILE))
+
+
+def _scalar_frame(data_dir, store_dir):
+    profiles = load_profile_table(data_dir=data_dir, store_dir=store_dir)
+    columns = ["steam64_id", "name", *[col for col in profiles.columns if col.startswith(SCALAR_PREFIXES)]]
+    return profiles[columns].set_index("steam64_id").sort_index()
+
+
+def _changed_rows(current, previous):
+    """Zeilen von current, die neu sind oder sich gegenüber previous geändert haben (NaN == NaN)."""
+    previous = previous.reindex(index=current.index, columns=current.columns)
+    same = (current == previous) | (current.isna() & previous.isna())
+    return current[~same.all(axis=1)]
+
+
+def record_snapshot(data_dir=PLAYER_DATA_DIR, snapshot_dir=SNAPSHOT_DIR, taken_at=None,
+                    store_dir=roster_store.STORE_DIR):
+    """Hängt den aktuellen Stand an. Liefert den Index-Eintrag oder None, wenn sich nichts geändert hat.
+
+    store_dir muss zu data_dir gehören: der Roster-Store wird sonst aus einem fremden Verzeichnis neu gebaut.
+    """
+    index = read_index(snapshot_dir)
+    # frisch, der Fetcher hat gerade erst geschrieben
+    version = data_version(data_dir, max_age=0)
+    if index and index[-1]["version"] == version:
+        return None
+
+    taken_at = (taken_at or datetime.now(timezone.utc)).astimezone(timezone.utc)
+    partition = taken_at.strftime("%Y-%m")
+    current = _scalar_frame(data_dir, store_dir)
+
+    full = not index or index[-1]["partition"] != partition
+    rows = current if full else _changed_rows(current, state_at(index[-1]["taken_at"], snapshot_dir))
+
+    file_name = f"{partition}/{taken_at.strftime('%Y%m%dT%H%M%SZ')}.arrow"
+    path = os.path.join(snapshot_dir, file_name)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    table = pa.Table.from_pandas(rows.reset_index(), preserve_index=False)
+    tmp_path = os.path.join(os.path.dirname(path), f".{os.path.basename(path)}")
+    feather.write_feather(table, tmp_path, compression="zstd")
+    os.replace(tmp_path, path)
+
+    entry = {
+        "taken_at": taken_at.isoformat(timespec="seconds"),
+        "partition": partition,
+        "file": file_name,
+        "full": full,
+        "rows": len(rows),
+        "version": version,
+    }
+    _write_index([*index, entry], snapshot_dir)
+    return entry
+
+
+def snapshot_times(snapshot_dir=SNAPSHOT_DIR):
+    return [pd.Timestamp(entry["taken_at"]) for entry in read_index(snapshot_dir)]
+
+
+def state_at(taken_at, snapshot_dir=SNAPSHOT_DIR):
+    """Skalare aller Spieler zum Zeitpunkt taken_at (letzter Snapshot davor), Index steam64_id."""
+    index = read_index(snapshot_dir)
+    times = [pd.Timestamp(entry["taken_at"]) for entry in index]
+    position = bisect.bisect_right(times, pd.Timestamp(taken_at)) - 1
+    if position < 0:
+        return pd.DataFrame(columns=["name"], index=pd.Index([], name="steam64_id"))
+
+    partition = index[position]["partition"]
+    first = position
+    while first > 0 and index[first - 1]["partition"] == partition:
+        first -= 1
+
+    # Vollbild des Monats plus Deltas, pro Spieler gewinnt die jüngste Zeile
+    frames = [
+        feather.read_table(os.path.join(snapshot_dir, entry["file"])).to_pandas()
+        for entry in index[first:position + 1]
+    ]
+    rows = pd.concat(frames, ignore_index=True)
+    return rows.drop_duplicates("steam64_id", keep="last").set_index("steam64_id").sort_index()
+
+
+def history_frame(taken_at, snapshot_dir=SNAPSHOT_DIR):
+    """Name plus HISTORY_COLUMNS zum Zeitpunkt taken_at, Index SteamID."""
+    state = state_at(taken_at, snapshot_dir)
+    if state.empty:
+        return pd.DataFrame(columns=["Name", *HISTORY_COLUMNS])
+
+    metrics = metric_frame(state.reset_index())
+    return metrics[["Name"]].assign(**{
+        column: state[source].to_numpy() if source else metrics[column]
+        for column, source in HISTORY_COLUMNS.items()
+    })
+
+
+def compare(start, end, snapshot_dir=SNAPSHOT_DIR):
+    """Werte zu start und end nebeneinander plus Differenz je Spalte aus HISTORY_COLUMNS."""
+    before = history_frame(start, snapshot_dir)
+    after = history_frame(end, snapshot_dir)
+    frame = after[["Name"]].combine_first(before[["Name"]])
+    for column in HISTORY_COLUMNS:
+        frame[f"{column} vorher"] = before[column]
+        frame[f"{column} nachher"] = after[column]
+        frame[f"{column} Δ"] = after[column] - before[column]
+    return frame
+
+
+if __name__ == "__main__":
+    entry = record_snapshot()
+    if entry is None:
+        print("ℹ️ Keine Änderung seit dem letzten Snapshot")
+    else:
+        print(f"✅ Snapshot {entry['taken_at']} ({'voll' if entry['full'] else 'Delta'}, {entry['rows']} Zeilen)")
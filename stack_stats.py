@@ -0,0 +1,81 @@
+import pandas as pd
+import streamlit as st
+import plotly.express as px
+
+from data_handling import data_version
+from dataset import player_names
+from teammate_network import best_duo_partner, duo_table, partners
+from perf import cache_call, cache_miss, span
+
+
+@st.cache_resource(max_entries=2)
+def load_stack_data(version):
+    """Duos innerhalb des Rosters mit Namen plus symmetrische Matrix der gemeinsamen Matches."""
+    cache_miss("st.load_stack_data")
+    names = player_names(version)
+
+    duos = duo_table()
+    duos = duos[duos["steam64_id"].isin(names.index) & duos["steam64_id_mate"].isin(names.index)]
+    duos.insert(0, "Spieler 1", duos["steam64_id"].map(names))
+    duos.insert(1, "Spieler 2", duos["steam64_id_mate"].map(names))
+    duos["Matches"] = duos[["shared_matches", "recent_matches_count"]].max(axis=1)
+
+    swapped = duos.rename(columns={"Spieler 1": "Spieler 2", "Spieler 2": "Spieler 1"})
+    matrix = pd.concat([duos, swapped]).pivot_table(
+        index="Spieler 1", columns="Spieler 2", values="Matches", fill_value=0
+    )
+    return duos, matrix, names
+
+
+st.title("👥Leetify Stack")
+st.markdown("---")
+
+with span("load", "stack"):
+    cache_call("st.load_stack_data")
+    df_duos, df_matrix, names_by_id = load_stack_data(data_version())
+
+if df_duos.empty:
+    st.warning("Keine gemeinsamen Matches in den geladenen Profilen gefunden.")
+    st.stop()
+
+st.header("Wer spielt mit wem?")
+fig = px.imshow(
+    df_matrix,
+    color_continuous_scale=px.colors.sequential.Turbo,
+    title="Gemeinsame Matches (recent_matches / recent_teammates)",
+)
+fig.update_layout(xaxis_title="", yaxis_title="")
+with span("render.serialize", "stack"):
+    st.plotly_chart(fig, use_container_width=True)
+
+st.header("Bester Duo-Partner")
+name_to_id = {name: steam_id for steam_id, name in names_by_id.items()}
+player = st.selectbox("Spieler:", options=sorted(name_to_id))
+min_matches = st.slider("Mindestens gemeinsame Matches:", 1, 30, 5)
+
+best = best_duo_partner(name_to_id[player], min_matches)
+if best is None:
+    st.info("Kein Mitspieler mit genug gemeinsamen Matches.")
+else:
+    partner_name = names_by_id.get(best["steam64_id_mate"], best["steam64_id_mate"])
+    st.metric(
+        f"{player} + {partner_name}",
+        f"{best['win_rate']:.0%} Winrate",
+        f"{best['shared_matches']} Matches zusammen",
+        delta_color="off",
+    )
+
+df_partners = partners(name_to_id[player])
+mate_ids = df_partners["steam64_id_mate"]
+df_partners = df_partners.assign(Mitspieler=mate_ids.map(names_by_id).fillna(mate_ids))
+st.dataframe(
+    df_partners[["Mitspieler", "shared_matches", "shared_wins", "win_rate", "recent_matches_count"]],
+    hide_index=True,
+)
+
+st.header("Alle Duos")
+st.dataframe(
+    df_duos[["Spieler 1", "Spieler 2", "Matches", "shared_wins", "win_rate"]]
+    .sort_values("Matches", ascending=False),
+    hide_index=True,
+)
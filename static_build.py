@@ -0,0 +1,184 @@
+"""Statischer Build der sechs Statistik-Seiten für den öffentlichen Link.
+
+    python static_build.py                    # nach static_site/, nur wenn sich der Datenstand geändert hat
+    python static_build.py --output /srv/www --force
+
+Pro Datenstand wird jede Seite einmal gerendert: <seite>.html plus die Plotly-Figuren
+als JSON unter assets/<seite>-<chart>.<hash>.json. Der Hash stammt aus dem Inhalt, die
+Assets können also unbegrenzt gecacht werden (CDN, Cache-Control immutable); nur die
+kleinen HTML-Seiten und build.json ändern sich pro Build. Die Assets des vorigen Builds
+bleiben eine Generation lang liegen, damit noch gecachte alte HTML-Seiten ihre Figuren
+finden; erst der übernächste Build räumt sie weg. Nach einer Ingestion genügt
+    python leetify_fetcher.py ... && python static_build.py
+"""
+import argparse
+import hashlib
+import html
+import json
+import os
+import shutil
+
+import plotly.offline
+
+from data_handling import data_version, get_data_date, get_page_stats
+from metrics import PAGES
+from perf import span
+from stats_page import bar_chart_specs, build_bar_chart, build_radar_chart, melt_radar_frame
+
+
+STATIC_DIR = "static_site"
+ASSETS_DIR = "assets"
+BUILD_FILE = "build.json"
+
+PAGE_TEMPLATE = """<!doctype html>
+<html lang="de">
+<head>
+<meta charset="utf-8">
+<meta name="viewport" content="width=device-width, initial-scale=1">
+<title>{title}</title>
+<script src="{plotly_js}"></script>
+<style>
+body {{ font-family: sans-serif; margin: 0 auto; max-width: 1200px; padding: 1rem; }}
+nav a {{ margin-right: 1rem; }}
+.figure {{ min-height: 450px; }}
+table {{ border-collapse: collapse; font-size: 0.9rem; }}
+td, th {{ border-bottom: 1px solid #ddd; padding: 0.25rem 0.5rem; text-align: right; }}
+</style>
+</head>
+<body>
+<nav>{nav}</nav>
+<h1>{title}</h1>
+<p>Datenstand: {data_date}</p>
+<hr>
+{body}
+<script>
+document.querySelectorAll(".figure").forEach(function (element) {{
+    fetch(element.dataset.src).then(function (response) {{ return response.json(); }}).then(function (fig) {{
+        Plotly.newPlot(element, fig.data, fig.layout, {{responsive: true}});
+    }});
+}});
+</script>
+</body>
+</html>
+"""
+
+
+def _content_hash(data):
+    return hashlib.sha256(data).hexdigest()[:12]
+
+
+def _write_asset(output_dir, stem, suffix, data):
+    """Schreibt ein Asset unter seinem Inhalts-Hash und liefert den relativen Pfad."""
+    name = f"{ASSETS_DIR}/{stem}.{_content_hash(data)}{suffix}"
+    path = os.path.join(output_dir, name)
+    if not os.path.exists(path):
+        tmp_path = os.path.join(output_dir, ASSETS_DIR, f".{os.path.basename(name)}")
+        with open(tmp_path, "wb") as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+    return name
+
+
+def _write_text(path, text):
+    tmp_path = os.path.join(os.path.dirname(path), f".{os.path.basename(path)}")
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        f.write(text)
+    os.replace(tmp_path, path)
+
+
+def build_page(page_key, output_dir, plotly_js, nav, data_date):
+    """Rendert eine Seite; liefert die Pfade der Figuren-Assets."""
+    page = PAGES[page_key]
+    df = get_page_stats(page_key)
+    assets = []
+
+    def figure_div(chart, fig):
+        src = _write_asset(output_dir, f"{page_key}-{chart}", ".json", fig.to_json().encode("utf-8"))
+        assets.append(src)
+        return f'<div class="figure" data-src="{src}"></div>'
+
+    parts = ["<h2>Vergleich der Spieler Rating Leetify (Radar Chart)</h2>"]
+    with span("build.figure", page_key, chart="radar"):
+        parts.append(figure_div("radar", build_radar_chart(melt_radar_frame(df, page_key), page_key)))
+
+    parts.append("<h2>Detailvergleiche (Bar Charts)</h2>")
+    for column, title, label, description in bar_chart_specs(page_key):
+        if description:
+            parts.append(f"<h3>{html.escape(column)}</h3><p>{html.escape(description)}</p>")
+        with span("build.figure", page_key, chart=column):
+            parts.append(figure_div(column, build_bar_chart(df, column, title, label)))
+
+    parts.append("<h2>Alle Werte</h2>")
+    parts.append(df.drop(columns="SteamID").to_html(index=False, float_format="{:.2f}".format, na_rep="-"))
+
+    _write_text(os.path.join(output_dir, f"{page_key}.html"), PAGE_TEMPLATE.format(
+        title=html.escape(page["title"]), plotly_js=plotly_js, nav=nav, data_date=data_date, body="\n".join(parts),
+    ))
+    return assets
+
+
+def _read_build(build_path):
+    try:
+        with open(build_path, encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def _prune_assets(output_dir, keep):
+    """Entfernt Assets, die weder der aktuelle noch der vorige Build referenziert."""
+    assets_dir = os.path.join(output_dir, ASSETS_DIR)
+    for name in os.listdir(assets_dir):
+        if f"{ASSETS_DIR}/{name}" not in keep:
+            os.remove(os.path.join(assets_dir, name))
+
+
+def build_site(output_dir=STATIC_DIR, force=False):
+    """Baut alle Seiten für den aktuellen Datenstand. Liefert build.json oder None, wenn nichts zu tun war."""
+    version = data_version()
+    build_path = os.path.join(output_dir, BUILD_FILE)
+    previous = _read_build(build_path)
+    if not force and previous is not None and previous.get("version") == version:
+        return None
+
+    os.makedirs(os.path.join(output_dir, ASSETS_DIR), exist_ok=True)
+    plotly_js = _write_asset(output_dir, "plotly", ".min.js", plotly.offline.get_plotlyjs().encode("utf-8"))
+    nav = " ".join(f'<a href="{key}.html">{html.escape(page["title"])}</a>' for key, page in PAGES.items())
+    data_date = get_data_date()
+    data_date_text = data_date.strftime("%d.%m.%Y %H:%M") if data_date else "-"
+
+    assets = {plotly_js}
+    for page_key in PAGES:
+        with span("build.page", page_key):
+            assets.update(build_page(page_key, output_dir, plotly_js, nav, data_date_text))
+
+    first_page = next(iter(PAGES))
+    _write_text(os.path.join(output_dir, "index.html"),
+                f'<!doctype html><meta charset="utf-8"><meta http-equiv="refresh" content="0; url={first_page}.html">')
+    # ohne vorigen build.json ist unbekannt, was alte Seiten noch referenzieren: dann nichts löschen
+    if previous is not None:
+        _prune_assets(output_dir, assets | set(previous.get("assets", [])))
+
+    build = {"version": version, "data_date": data_date_text, "pages": list(PAGES), "assets": sorted(assets)}
+    _write_text(build_path, json.dumps(build, indent=1))
+    return build
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Statistik-Seiten als statisches HTML/JSON bauen")
+    parser.add_argument("--output", default=STATIC_DIR)
+    parser.add_argument("--force", action="store_true", help="auch bauen, wenn sich der Datenstand nicht geändert hat")
+    parser.add_argument("--clean", action="store_true", help="Ausgabeverzeichnis vorher leeren")
+    args = parser.parse_args()
+
+    if args.clean:
+        shutil.rmtree(args.output, ignore_errors=True)
+    build = build_site(args.output, args.force)
+    if build is None:
+        print("ℹ️ Datenstand unverändert, nichts zu bauen")
+    else:
+        print(f"✅ {len(build['pages'])} Seiten, {len(build['assets'])} Assets nach {args.output}/ gebaut")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,196 @@
+import streamlit as st
+import plotly.express as px
+
+from data_handling import data_version
+from dataset import page_frame
+from metrics import PAGES, page_columns, radar_metrics
+from perf import cache_call, cache_miss, span
+from profile_quality import FULL, QUALITY_LABELS, quality_frame
+from ranking import leaderboard, page_ranking
+
+
+def melt_radar_frame(df, page_key, scaled=True):
+    """Long-Form (Name, Metric, Score) der Radar-Metriken, mit scaled inklusive radar_scale."""
+    metrics = radar_metrics(page_key)
+
+    df_scaled = df[["Name", *[metric["column"] for metric in metrics]]]
+    if scaled:
+        df_scaled = df_scaled.assign(**{
+            metric["column"]: df_scaled[metric["column"]] * metric["radar_scale"]
+            for metric in metrics if "radar_scale" in metric
+        })
+
+    return df_scaled.melt(
+        id_vars=['Name'],
+        var_name='Metric',
+        value_name='Score'
+    )
+
+
+@st.cache_resource(max_entries=40)
+def load_long_data(version, page_key, normalized=False):
+    """Long-Form aller Spieler einer Seite (Rohwerte oder Perzentile), wird pro Auswahl nur noch gefiltert."""
+    cache_miss("st.load_long_data")
+    if normalized:
+        return melt_radar_frame(page_ranking(page_key), page_key, scaled=False)
+    return melt_radar_frame(page_frame(version, page_key), page_key)
+
+
+def build_radar_chart(df_long, page_key, radar_range=None):
+    """Radar Chart über die Radar-Metriken einer Seite (erwartet melt_radar_frame)."""
+    radar_range = radar_range or PAGES[page_key].get("radar_range")
+
+    fig_radar = px.line_polar(
+        df_long,
+        r='Score',
+        theta='Metric',
+        color='Name',
+        line_close=True,
+        # ab ~1000 Punkten würde plotly auf WebGL umschalten, das kein line_close kann
+        render_mode="svg",
+        title="Vergleich der Spielerleistungen auf Basis der Leetify-Statistiken"
+    )
+
+    radialaxis = dict(visible=True)
+    if radar_range:
+        radialaxis["range"] = radar_range
+
+    fig_radar.update_traces(fill='toself', opacity=0.5)
+    fig_radar.update_layout(
+        polar=dict(radialaxis=radialaxis),
+        legend_title_text='Spieler'
+    )
+    return fig_radar
+
+
+def build_bar_chart(df, y_col, title, y_label):
+    fig = px.bar(
+        df,
+        x='Name',
+        y=y_col,
+        title=title,
+        color=y_col,
+        color_continuous_scale=px.colors.sequential.Turbo
+    )
+    fig.update_layout(xaxis_title="Spieler", yaxis_title=y_label)
+    return fig
+
+
+def render_stats_page(page_key):
+    """Rendert eine komplette Statistik-Seite anhand der Registry in metrics.py."""
+    page = PAGES[page_key]
+    # Titel zuerst, damit die Seite steht, bevor die Daten geladen sind
+    st.title(page["title"])
+    st.markdown("---")
+
+    version = data_version()
+    with span("load", page_key):
+        df_stats = page_frame(version, page_key)
+
+    player_options = df_stats['Name'].unique().tolist()
+    render_quality_note(df_stats)
+
+    selected_players = st.multiselect(
+        "Wähle die Spieler für den Vergleich:",
+        options=player_options,
+        default=player_options,
+    )
+
+    if not selected_players:
+        st.warning("Bitte wähle mindestens einen Spieler aus, um die Statistiken anzuzeigen.")
+        st.stop()
+
+    with span("transform.filter", page_key):
+        df_filtered = df_stats[df_stats['Name'].isin(selected_players)]
+
+    st.header("Vergleich der Spieler Rating Leetify (Radar Chart)")
+    normalized = st.radio(
+        "Radar-Skala:", ["Rohwerte", "Perzentil"], horizontal=True, key=f"{page_key}_radar_scale",
+        help="Perzentil im Roster, 100 = bester Wert (bei Metriken wie reaction_time_ms ist weniger besser)",
+    ) == "Perzentil"
+    if not df_filtered.empty:
+        with span("transform.melt", page_key):
+            cache_call("st.load_long_data")
+            df_long = load_long_data(version, page_key, normalized)
+            df_long = df_long[df_long['Name'].isin(selected_players)]
+        radar_range = [0, 100] if normalized else None
+        with span("render.figure", page_key, chart="radar"):
+            fig_radar = build_radar_chart(df_long, page_key, radar_range)
+        with span("render.serialize", page_key, chart="radar"):
+            st.plotly_chart(fig_radar, use_container_width=True)
+
+    st.markdown("---")
+    st.subheader("Detailvergleiche (Bar Charts)")
+
+    render_bar_charts(df_filtered, page_key)
+
+    st.markdown("---")
+    st.subheader("Rangliste")
+    render_leaderboard(page_key)
+
+
+def render_quality_note(df_stats):
+    """Hinweis auf private oder unvollständige Profile, deren fehlende Werte leer bleiben."""
+    with span("load.quality"):
+        quality = quality_frame()
+    incomplete = quality[quality["Qualität"] != FULL]
+    names = df_stats.set_index("SteamID")["Name"]
+    players = [
+        f"{names.get(steam_id, steam_id)} ({QUALITY_LABELS[row['Qualität']]})"
+        for steam_id, row in incomplete.iterrows() if steam_id in names.index
+    ]
+    if players:
+        st.caption(f"ℹ️ Profile mit fehlenden Daten (leere Werte hat Leetify nicht geliefert): {', '.join(players)}")
+
+
+def bar_chart_specs(page_key):
+    """(Spalte, Titel, Achsenbeschriftung, Beschreibung) aller Bar Charts einer Seite."""
+    page = PAGES[page_key]
+    specs = []
+
+    highlight = page.get("highlight")
+    if highlight:
+        specs.append((highlight["column"], highlight["title"], highlight["label"], highlight["description"]))
+
+    for metric in radar_metrics(page_key):
+        column = metric["column"]
+        specs.append((column, column, column, None))
+    return specs
+
+
+def _render_bar_chart(df, spec, page_key):
+    column, title, label, description = spec
+    if description:
+        st.subheader(column)
+        st.markdown(description)
+    with span("render.figure", page_key, chart=column):
+        fig = build_bar_chart(df, column, title, label)
+    with span("render.serialize", page_key, chart=column):
+        st.plotly_chart(fig, use_container_width=True)
+
+
+@st.fragment
+def render_bar_charts(df_filtered, page_key):
+    """Baut standardmäßig nur das ausgewählte Bar Chart; die Auswahl rerunt nur dieses Fragment."""
+    specs = bar_chart_specs(page_key)
+
+    show_all = st.toggle("Alle Bar Charts anzeigen", value=False, key=f"{page_key}_all_bars")
+    if show_all:
+        for spec in specs:
+            _render_bar_chart(df_filtered, spec, page_key)
+        return
+
+    columns = [spec[0] for spec in specs]
+    selected = st.segmented_control(
+        "Metrik:", options=columns, default=columns[0], key=f"{page_key}_bar_metric"
+    ) or columns[0]
+    _render_bar_chart(df_filtered, specs[columns.index(selected)], page_key)
+
+
+@st.fragment
+def render_leaderboard(page_key):
+    """Rangliste einer Metrik über den ganzen Roster."""
+    column = st.selectbox("Metrik:", options=page_columns(page_key), key=f"{page_key}_leaderboard_metric")
+    with span("transform.leaderboard", page_key):
+        df_leaderboard = leaderboard(column)
+    st.dataframe(df_leaderboard, hide_index=True)
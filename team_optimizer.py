@@ -0,0 +1,167 @@
+"""Bester 5er-Stack aus dem Roster unter Rollen-Vorgaben.
+
+Jeder Spieler bekommt einen Score aus den Perzentilen der Rating-Metriken (gewichtet)
+plus einem Map-Bonus aus seiner Winrate auf der gewählten Map (aus recent_matches,
+Richtung 50 % gezogen, solange es wenige Matches sind). Eine Rolle gilt als abgedeckt,
+wenn mindestens ein Spieler in der zugehörigen Metrik bei ROLE_PERCENTILE oder besser
+liegt; die Rollen eines Spielers stecken als Bitmaske in einem int.
+
+Statt alle Kombinationen durchzuprobieren, läuft die Suche einmal über die Spieler
+und merkt sich pro (Teamgröße, abgedeckte Rollen) nur die besten Teilteams; jeder
+Schritt bewertet alle 32 Rollenzustände auf einmal in NumPy. Vorher fallen alle
+Spieler raus, die in ihrer Rollenmaske nicht unter den Besten sind, die Suche
+bleibt damit auch bei Hunderten Spielern im Millisekundenbereich und ist exakt.
+"""
+import numpy as np
+import pandas as pd
+
+from match_history import get_map_aggregate
+from ranking import ranking_frame
+
+
+TEAM_SIZE = 5
+ROLE_PERCENTILE = 60
+# Winrate wird mit so vielen virtuellen Matches bei 50 % gemischt
+WIN_RATE_PRIOR_MATCHES = 10
+
+ROLES = {
+    "Entry": "Opening_Kill_Success",
+    "Support": "Utility_Rating",
+    "Clutch": "Clutch_Percentage",
+    "Anchor": "Positioning_Rating",
+    "Aim": "Aim_Rating",
+}
+ALL_MAPS = "alle"
+
+
+def _win_rates(map_name=ALL_MAPS):
+    """Matches und geglättete Winrate pro Spieler, über alle Quellen und optional nur eine Map."""
+    aggregate = get_map_aggregate().reset_index()
+    if map_name != ALL_MAPS:
+        aggregate = aggregate[aggregate["map_name"] == map_name]
+    totals = aggregate.groupby("steam64_id")[["matches", "wins"]].sum()
+    totals["win_rate"] = (totals["wins"] + WIN_RATE_PRIOR_MATCHES / 2) / (totals["matches"] + WIN_RATE_PRIOR_MATCHES)
+    return totals
+
+
+def player_table(map_name=ALL_MAPS):
+    """Name, Perzentile der Rollen-Metriken, Matches und Winrate (Index SteamID)."""
+    table = ranking_frame("percentile", list(ROLES.values())).set_index("SteamID")
+    win_rates = _win_rates(map_name)
+    table["matches"] = win_rates["matches"].reindex(table.index).fillna(0).astype(int)
+    table["win_rate"] = win_rates["win_rate"].reindex(table.index).fillna(0.5)
+    return table
+
+
+def role_masks(table, threshold=ROLE_PERCENTILE):
+    masks = np.zeros(len(table), dtype=np.int64)
+    for bit, column in enumerate(ROLES.values()):
+        masks |= (table[column].fillna(0).to_numpy() >= threshold).astype(np.int64) << bit
+    return masks
+
+
+def player_scores(table, weights=None, map_weight=1.0):
+    """Gewichtete Summe der Perzentile plus Map-Bonus (Winrate-Abstand zu 50 % in Prozentpunkten)."""
+    weights = weights or {}
+    scores = np.zeros(len(table))
+    for column in ROLES.values():
+        scores += weights.get(column, 1.0) * table[column].fillna(0).to_numpy()
+    return scores + map_weight * (table["win_rate"].to_numpy() - 0.5) * 100
+
+
+def _popcount(values):
+    counts = np.zeros_like(values)
+    for bit in range(len(ROLES)):
+        counts += (values >> bit) & 1
+    return counts
+
+
+def _dominant(scores, masks, per_mask):
+    """Positionen der per_mask besten Spieler je Rollenmaske.
+
+    Ein schwächerer Spieler mit derselben Maske kann nur in einem der besten Teams
+    stehen, wenn alle stärkeren schon drin sind; mehr als team_size + top - 1 pro Maske
+    braucht die Suche also nie.
+    """
+    order = np.lexsort((-scores, masks))
+    sorted_masks = masks[order]
+    rank = np.arange(len(order)) - np.searchsorted(sorted_masks, sorted_masks)
+    return np.sort(order[rank < per_mask])
+
+
+def search_teams(scores, masks, required, team_size=TEAM_SIZE, top=5):
+    """Beste Teams als Liste von (Positionen, Score, Rollenmaske), bestes zuerst.
+
+    Vollständige Rollenabdeckung geht vor Score; gibt es kein Team, das alle
+    geforderten Rollen abdeckt, kommen die mit den wenigsten fehlenden Rollen.
+    """
+    team_size = min(team_size, len(scores))
+    if team_size == 0:
+        return []
+    covered = masks & required
+    states = np.arange(1 << len(ROLES))
+    target_states = np.repeat(states, top)
+
+    # best[größe, abgedeckte rollen] = die top besten Scores, members die Positionen dazu
+    best = np.full((team_size + 1, len(states), top), -np.inf)
+    best[0, 0, 0] = 0.0
+    members = np.full((team_size + 1, len(states), top, team_size), -1)
+
+    for player in _dominant(scores, covered, team_size + top - 1):
+        # absteigend, damit jeder Spieler nur einmal pro Team vorkommt
+        for size in range(team_size, 0, -1):
+            if not np.isfinite(best[size - 1]).any():
+                continue
+            added = members[size - 1].reshape(-1, team_size).copy()
+            added[:, size - 1] = player
+
+            merged_states = np.concatenate([target_states, target_states | covered[player]])
+            merged_scores = np.concatenate([best[size].ravel(), best[size - 1].ravel() + scores[player]])
+            merged_members = np.concatenate([members[size].reshape(-1, team_size), added])
+
+            # pro Zielzustand die top besten behalten
+            order = np.lexsort((-merged_scores, merged_states))
+            sorted_states = merged_states[order]
+            keep = order[np.arange(len(order)) - np.searchsorted(sorted_states, sorted_states) < top]
+            best[size] = merged_scores[keep].reshape(len(states), top)
+            members[size] = merged_members[keep].reshape(len(states), top, team_size)
+
+    final_scores = best[team_size].ravel()
+    missing = _popcount(required & ~target_states)
+    ranking = np.lexsort((-final_scores, missing))
+    ranking = ranking[np.isfinite(final_scores[ranking])][:top]
+    final_members = members[team_size].reshape(-1, team_size)
+    return [
+        (final_members[index], float(final_scores[index]), int(np.bitwise_or.reduce(masks[final_members[index]])))
+        for index in ranking
+    ]
+
+
+def roles_of(mask):
+    return [role for bit, role in enumerate(ROLES) if mask >> bit & 1]
+
+
+def optimize(table, weights=None, map_weight=1.0, required_roles=tuple(ROLES),
+             team_size=TEAM_SIZE, top=5):
+    """Beste Teams aus table (siehe player_table, ggf. schon auf den Pool gefiltert)."""
+    required = sum(1 << bit for bit, role in enumerate(ROLES) if role in required_roles)
+    teams = search_teams(player_scores(table, weights, map_weight), role_masks(table), required, team_size, top)
+    return [
+        {"steam_ids": table.index[positions].tolist(), "score": score, "roles": roles_of(mask),
+         "missing_roles": [role for role in required_roles if role not in roles_of(mask)]}
+        for positions, score, mask in teams
+    ]
+
+
+def team_frame(table, team, weights=None, map_weight=1.0):
+    """Die Spieler eines Teams mit ihren Rollen, Metriken und Score."""
+    members = table.loc[team["steam_ids"]]
+    masks = role_masks(table)[table.index.get_indexer(team["steam_ids"])]
+    return pd.DataFrame({
+        "Name": members["Name"].to_numpy(),
+        "Rollen": [", ".join(roles_of(mask)) for mask in masks],
+        **{column: members[column].to_numpy() for column in ROLES.values()},
+        "Matches": members["matches"].to_numpy(),
+        "Winrate": members["win_rate"].to_numpy(),
+        "Score": player_scores(members, weights, map_weight),
+    })
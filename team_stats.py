@@ -0,0 +1,62 @@
+import streamlit as st
+import plotly.express as px
+
+from match_history import get_map_aggregate
+from perf import span
+from team_optimizer import ALL_MAPS, ROLES, optimize, player_table, team_frame
+
+
+st.title("🧩Leetify Lineup")
+st.markdown("---")
+
+with span("load", "team"):
+    map_names = sorted(get_map_aggregate().index.get_level_values("map_name").unique())
+
+col_map, col_roles = st.columns(2)
+map_name = col_map.selectbox("Map:", options=[ALL_MAPS, *map_names])
+required_roles = col_roles.multiselect("Diese Rollen müssen abgedeckt sein:", options=list(ROLES), default=list(ROLES))
+
+with st.expander("Gewichtung"):
+    weight_columns = st.columns(len(ROLES))
+    weights = {
+        column: weight_col.slider(role, 0.0, 3.0, 1.0, 0.25)
+        for weight_col, (role, column) in zip(weight_columns, ROLES.items())
+    }
+    map_weight = st.slider("Map-Winrate (Punkte pro Prozentpunkt über 50 %):", 0.0, 5.0, 1.0, 0.25)
+
+with span("transform.team_table", "team"):
+    table = player_table(map_name)
+
+pool = st.multiselect("Spielerpool (leer = alle):", options=sorted(table["Name"]))
+if pool:
+    table = table[table["Name"].isin(pool)]
+
+with span("transform.team_search", "team"):
+    teams = optimize(table, weights, map_weight, required_roles)
+
+if not teams:
+    st.warning("Nicht genug Spieler für ein Team.")
+    st.stop()
+
+best = teams[0]
+st.header(f"Bestes Team (Score {best['score']:.0f})")
+if best["missing_roles"]:
+    st.warning(f"Kein Team deckt alle Rollen ab, es fehlt: {', '.join(best['missing_roles'])}")
+
+df_best = team_frame(table, best, weights, map_weight)
+st.dataframe(df_best, hide_index=True, column_config={"Winrate": st.column_config.NumberColumn(format="percent")})
+
+df_long = df_best.melt(id_vars=["Name"], value_vars=list(ROLES.values()), var_name="Metric", value_name="Perzentil")
+fig = px.line_polar(df_long, r="Perzentil", theta="Metric", color="Name", line_close=True, render_mode="svg",
+                    title="Rollen-Metriken des Teams (Perzentil im Roster)")
+fig.update_traces(fill="toself", opacity=0.5)
+fig.update_layout(polar=dict(radialaxis=dict(visible=True, range=[0, 100])), legend_title_text="Spieler")
+with span("render.serialize", "team"):
+    st.plotly_chart(fig, use_container_width=True)
+
+if len(teams) > 1:
+    st.header("Alternativen")
+    names = table["Name"]
+    for team in teams[1:]:
+        missing = f" – es fehlt: {', '.join(team['missing_roles'])}" if team["missing_roles"] else ""
+        st.markdown(f"**{team['score']:.0f}**: {', '.join(names.loc[team['steam_ids']])}{missing}")
@@ -0,0 +1,103 @@
+"""Wer spielt mit wem: dünn besetzte Adjazenz (SteamID × SteamID) mit Matches und Siegen.
+
+Die Kanten stammen aus gemeinsamen Match-IDs in recent_matches (gleiches Team =
+gleiches Ergebnis und gleicher Score) sowie aus recent_teammates. Bei einem
+Unentschieden haben beide Teams dasselbe Ergebnis und denselben Score; solche Matches
+zählen nur für Paare, die recent_teammates als Mitspieler bestätigt. Gespeichert wird
+wie bei einer CSR-Matrix: pro Spieler ein zusammenhängender, nach Winrate
+sortierter Bereich in den Kanten-Arrays, Abfragen sind damit reine Slices.
+"""
+import numpy as np
+import pandas as pd
+
+from data_handling import PLAYER_DATA_DIR, data_version, load_store_table
+from match_history import get_match_index
+
+
+# ((data_dir, data_version), network)
+_NETWORK = None
+
+
+def _shared_matches(player_matches, confirmed):
+    """Alle Paare (a, b) mit a != b, die im selben Match im selben Team standen.
+
+    confirmed: Paare (steam64_id, steam64_id_mate) aus recent_teammates, in beiden Richtungen;
+    nur sie zählen bei Unentschieden, wo Gegner sonst wie Mitspieler aussehen.
+    """
+    left = player_matches[["match_id", "steam64_id", "outcome", "score_team"]]
+    pairs = left.merge(left, on=["match_id", "outcome", "score_team"], suffixes=("", "_mate"))
+    pairs = pairs[pairs["steam64_id"] != pairs["steam64_id_mate"]]
+    tie = pairs["outcome"] == "tie"
+    if tie.any():
+        tie_pairs = pd.MultiIndex.from_frame(pairs.loc[tie, ["steam64_id", "steam64_id_mate"]])
+        tie_kept = pd.Series(tie_pairs.isin(confirmed), index=pairs.index[tie])
+        pairs = pairs[~tie | tie_kept.reindex(pairs.index, fill_value=True)]
+    pairs = pairs.assign(win=(pairs["outcome"] == "win").astype(int))
+    return pairs.groupby(["steam64_id", "steam64_id_mate"]).agg(
+        shared_matches=("match_id", "size"),
+        shared_wins=("win", "sum"),
+    )
+
+
+def build_network(data_dir=PLAYER_DATA_DIR):
+    _, player_matches = get_match_index(data_dir)
+
+    teammates = load_store_table("teammates", data_dir=data_dir).rename(
+        columns={"teammate_steam64_id": "steam64_id_mate"}
+    ).set_index(["steam64_id", "steam64_id_mate"])
+    confirmed = teammates.index.append(teammates.index.swaplevel())
+
+    edges = _shared_matches(player_matches, confirmed) if not player_matches.empty else \
+        pd.DataFrame(columns=["shared_matches", "shared_wins"],
+                     index=pd.MultiIndex.from_arrays([[], []], names=["steam64_id", "steam64_id_mate"]))
+
+    edges = edges.join(teammates, how="outer").fillna(0).astype(int).reset_index()
+
+    # symmetrisch machen: private Profile haben keine eigenen recent_teammates
+    swapped = edges.rename(columns={"steam64_id": "steam64_id_mate", "steam64_id_mate": "steam64_id"})
+    edges = pd.concat([edges, swapped]).groupby(["steam64_id", "steam64_id_mate"], as_index=False).max()
+    edges["win_rate"] = edges["shared_wins"] / edges["shared_matches"].where(edges["shared_matches"] > 0)
+
+    # CSR-Layout: nach Spieler, dann beste Winrate / meiste Matches zuerst
+    edges = edges.sort_values(
+        ["steam64_id", "win_rate", "shared_matches"], ascending=[True, False, False], na_position="last",
+        ignore_index=True,
+    )
+    ids = np.unique(np.concatenate([edges["steam64_id"].to_numpy(), edges["steam64_id_mate"].to_numpy()]))
+    rows = np.searchsorted(ids, edges["steam64_id"].to_numpy())
+    indptr = np.searchsorted(rows, np.arange(len(ids) + 1))
+
+    return {"ids": ids, "indptr": indptr, "edges": edges}
+
+
+def get_network(data_dir=PLAYER_DATA_DIR):
+    """Teammate-Netz, wird nur bei geänderten Profildateien neu gebaut."""
+    global _NETWORK
+
+    key = (data_dir, data_version(data_dir))
+    if _NETWORK is None or _NETWORK[0] != key:
+        _NETWORK = (key, build_network(data_dir))
+    return _NETWORK[1]
+
+
+def partners(steam64_id, data_dir=PLAYER_DATA_DIR):
+    """Alle Mitspieler eines Spielers, beste Winrate zuerst."""
+    network = get_network(data_dir)
+    position = np.searchsorted(network["ids"], steam64_id)
+    if position == len(network["ids"]) or network["ids"][position] != steam64_id:
+        return network["edges"].iloc[0:0]
+    start, stop = network["indptr"][position], network["indptr"][position + 1]
+    return network["edges"].iloc[start:stop]
+
+
+def best_duo_partner(steam64_id, min_matches=5, data_dir=PLAYER_DATA_DIR):
+    """Mitspieler mit der höchsten gemeinsamen Winrate (mindestens `min_matches` zusammen)."""
+    candidates = partners(steam64_id, data_dir)
+    candidates = candidates[candidates["shared_matches"] >= min_matches]
+    return None if candidates.empty else candidates.iloc[0]
+
+
+def duo_table(data_dir=PLAYER_DATA_DIR):
+    """Jedes Duo genau einmal (a < b)."""
+    edges = get_network(data_dir)["edges"]
+    return edges[edges["steam64_id"] < edges["steam64_id_mate"]].reset_index(drop=True)